@@ -2,6 +2,11 @@
 GUI Module for Smart Assistant
 """
 
-from gui.app_chatgpt_style import main
+
+def main():
+    """Start the GUI (PyQt6 and the app are imported here, not on package import)"""
+    from gui.app_chatgpt_style import main as run_app
+    return run_app()
+
 
 __all__ = ['main']
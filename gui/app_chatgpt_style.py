@@ -35,6 +35,7 @@ from core.speaker import Speaker
 from core.memory import Memory
 from gui.themes import theme_manager, Theme
 from core.document_processor import DocumentProcessor
+from utils.config import load_user_settings, get_user_setting, save_user_setting
 
 
 class WorkerThread(QThread):
@@ -1092,7 +1093,6 @@ class SettingsDialog(QDialog):
     
     def _load_current_settings(self):
         """Load current settings from user config"""
-        from utils.config import load_user_settings
         settings = load_user_settings()
         
         # Map theme names
@@ -1796,7 +1796,6 @@ class SmartAssistantWindow(QMainWindow):
     def apply_dark_theme(self):
         """Apply modern dark theme"""
         # Load theme from user settings and apply
-        from utils.config import get_user_setting
         theme_name = get_user_setting('theme', 'dark')
         self.apply_theme(theme_name)
     
@@ -2365,7 +2364,6 @@ class SmartAssistantWindow(QMainWindow):
             settings = dialog.get_settings()
             
             # Save and apply theme
-            from utils.config import save_user_setting
             if 'theme' in settings:
                 save_user_setting('theme', settings['theme'])
                 self.apply_theme(settings['theme'])
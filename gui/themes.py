@@ -3,13 +3,17 @@ Smart Assistant Theme System
 Provides multiple themes with easy switching capability
 """
 
-from PyQt6.QtGui import QColor, QPalette
-from PyQt6.QtWidgets import QApplication
 from dataclasses import dataclass
-from typing import Dict
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict
 
+# Qt is imported lazily so headless code can use themes without loading it
+if TYPE_CHECKING:
+    from PyQt6.QtGui import QColor
+    from PyQt6.QtWidgets import QApplication
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Theme:
     """Theme configuration"""
     name: str
@@ -161,9 +165,33 @@ MIDNIGHT_THEME = Theme(
 )
 
 
+class ThemeRuntime:
+    """Theme with its Qt colors parsed once and reused"""
+    
+    def __init__(self, theme: Theme):
+        self.theme = theme
+    
+    @cached_property
+    def bg_qcolor(self) -> 'QColor':
+        from PyQt6.QtGui import QColor
+        return QColor(self.theme.background)
+    
+    @cached_property
+    def surface_qcolor(self) -> 'QColor':
+        from PyQt6.QtGui import QColor
+        return QColor(self.theme.surface)
+    
+    @cached_property
+    def text_qcolor(self) -> 'QColor':
+        from PyQt6.QtGui import QColor
+        return QColor(self.theme.text_primary)
+
+
 class ThemeManager:
     """Manages theme switching and application"""
     
+    WIDGET_TYPES = ("main", "input", "button_primary", "user_bubble", "ai_bubble")
+    
     THEMES: Dict[str, Theme] = {
         "dark": DARK_THEME,
         "light": LIGHT_THEME,
@@ -172,32 +200,41 @@ class ThemeManager:
     }
     
     def __init__(self):
-        self.current_theme = DARK_THEME
+        # One runtime per theme so switching back reuses parsed colors
+        self._runtimes: Dict[str, ThemeRuntime] = {
+            name: ThemeRuntime(theme) for name, theme in self.THEMES.items()
+        }
+        self.current_theme = self._runtimes["dark"]
+        self._stylesheet_cache: Dict[str, str] = {}
+        self._render_all()
     
     def set_theme(self, theme_name: str):
         """Set the current theme"""
-        if theme_name.lower() in self.THEMES:
-            self.current_theme = self.THEMES[theme_name.lower()]
+        if theme_name.lower() in self._runtimes:
+            self.current_theme = self._runtimes[theme_name.lower()]
+            self._render_all()
             return True
         return False
     
     def get_theme(self) -> Theme:
         """Get current theme"""
-        return self.current_theme
+        return self.current_theme.theme
     
     def get_available_themes(self) -> list:
         """Get list of available theme names"""
         return list(self.THEMES.keys())
     
-    def apply_to_palette(self, app: QApplication):
+    def apply_to_palette(self, app: 'QApplication'):
         """Apply theme to Qt palette"""
+        from PyQt6.QtGui import QPalette
+        
         palette = QPalette()
-        theme = self.current_theme
+        runtime = self.current_theme
         
-        # Parse colors
-        bg_color = QColor(theme.background)
-        surface_color = QColor(theme.surface)
-        text_color = QColor(theme.text_primary)
+        # Colors are parsed once per theme
+        bg_color = runtime.bg_qcolor
+        surface_color = runtime.surface_qcolor
+        text_color = runtime.text_qcolor
         
         palette.setColor(QPalette.ColorRole.Window, bg_color)
         palette.setColor(QPalette.ColorRole.WindowText, text_color)
@@ -211,7 +248,18 @@ class ThemeManager:
     
     def get_stylesheet(self, widget_type: str = "main") -> str:
         """Get stylesheet for specific widget type"""
-        theme = self.current_theme
+        return self._stylesheet_cache.get(widget_type, "")
+    
+    def _render_all(self):
+        """Render the stylesheet of every widget type for the current theme"""
+        self._stylesheet_cache = {
+            widget_type: self._render_stylesheet(widget_type)
+            for widget_type in self.WIDGET_TYPES
+        }
+    
+    def _render_stylesheet(self, widget_type: str) -> str:
+        """Build stylesheet for specific widget type"""
+        theme = self.current_theme.theme
         
         if widget_type == "main":
             return f"""
@@ -6,78 +6,169 @@ Detects user intents and executes system commands
 import re
 from typing import Dict, Any, Optional, Tuple
 
+# System tools (optional - need psutil/pycaw)
+try:
+    from tools.applications import (
+        search_chrome, search_youtube, open_settings, open_website
+    )
+    from tools.executor import get_shared_tool
+    HAS_TOOLS = True
+except ImportError:
+    HAS_TOOLS = False
+
+
+# Command patterns in priority order (volume before open_app so that
+# "open volume settings" is not treated as an application name)
+_RAW = (
+    # Volume commands
+    ('volume_up', (
+        r'(?:increase|raise|turn up|up)\s+(?:the\s+)?volume',
+        r'volume\s+up',
+        r'louder',
+    )),
+    ('volume_down', (
+        r'(?:decrease|lower|turn down|down)\s+(?:the\s+)?volume',
+        r'volume\s+down',
+        r'(?:make it\s+)?quieter',
+    )),
+    ('volume_mute', (
+        r'mute(?:\s+(?:the\s+)?(?:sound|volume|audio))?',
+        r'silence(?:\s+(?:the\s+)?(?:sound|volume))?',
+    )),
+    ('volume_unmute', (
+        r'unmute(?:\s+(?:the\s+)?(?:sound|volume|audio))?',
+        r'turn\s+(?:the\s+)?sound\s+back\s+on',
+    )),
+    ('volume_set', (
+        r'(?:set|change)\s+(?:the\s+)?volume\s+to\s+(\d+)',
+        r'volume\s+(\d+)\s*(?:percent|%)?',
+    )),
+    
+    # Settings commands
+    ('open_settings', (
+        r'open\s+(?:windows\s+)?settings',
+        r'(?:go|take me)\s+to\s+settings',
+        r'show\s+(?:me\s+)?settings',
+    )),
+    
+    # Search commands
+    ('search_chrome', (
+        r'search\s+(?:for\s+)?"?(.+?)"?\s+(?:on|in)\s+(?:chrome|web|google)',
+        r'google\s+"?(.+?)"?',
+        r'search\s+"?(.+?)"?\s+on\s+(?:chrome|web)',
+        r'look up\s+"?(.+?)"?\s+(?:on\s+)?(?:chrome|web)',
+        r'(?:chrome|web)\s+search\s+"?(.+?)"?',
+        r'search\s+(?:the\s+)?(?:web|internet)\s+for\s+"?(.+?)"?',
+    )),
+    ('search_youtube', (
+        r'search\s+(?:for\s+)?"?(.+?)"?\s+(?:on|in)\s+youtube',
+        r'(?:find|search)\s+youtube\s+(?:for\s+)?"?(.+?)"?$',
+        r'look up\s+"?(.+?)"?\s+(?:on\s+)?youtube',
+        r'youtube\s+search\s+"?(.+?)"?$',
+        r'"(.+)"\s+search\s+(?:on\s+)?youtube',
+        r'search\s+"(.+)"\s+on\s+youtube',
+    )),
+    
+    # Application commands
+    ('open_app', (
+        r'open\s+(.+?)(?:\s+(?:app|application|program))?$',
+        r'launch\s+(.+)',
+        r'start\s+(.+?)(?:\s+(?:app|application))?$',
+    )),
+    
+    # Website commands
+    ('open_website', (
+        r'(?:open|go to|visit)\s+(.+?)\s+(?:on\s+)?(?:chrome|browser)',
+        r'visit\s+(?:website\s+)?(.+)',
+        r'(?:open|go to)\s+(?:the\s+)?website\s+(.+)',
+        r'browse\s+(?:to\s+)?(\S+\.(?:com|org|net|io|co|in))\b',
+    )),
+)
+
+# Compiled once at import; a plain tuple walk keeps the priority order
+_PATTERNS: Tuple[Tuple[str, Tuple[re.Pattern, ...]], ...] = tuple(
+    (name, tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns))
+    for name, patterns in _RAW
+)
+
+
+def _param(key, convert=str.strip):
+    """Build an extractor that stores the first capture group under key"""
+    return lambda value: {key: convert(value)}
+
+
+def _unquote(value):
+    """Strip whitespace and surrounding quotes from a captured query"""
+    return value.strip().strip('"').strip()
+
+
+# Per-command parameter extraction from the first capture group
+_EXTRACTORS = {
+    'search_chrome': _param('query', _unquote),
+    'search_youtube': _param('query', _unquote),
+    'volume_set': _param('level', int),
+    'open_app': _param('app_name'),
+    'open_website': _param('url'),
+}
+
+
+# Tools are the executor's shared instances (one volume endpoint per process)
+def _get_system_tool():
+    """Get the shared SystemTool instance"""
+    return get_shared_tool('system_control')
+
+
+def _get_app_tool():
+    """Get the shared ApplicationTool instance"""
+    return get_shared_tool('application_control')
+
+
+def _do_search_chrome(params: Dict[str, Any]) -> Dict[str, Any]:
+    query = params.get('query', '')
+    if not query:
+        return {'success': False, 'error': 'No search query provided'}
+    return search_chrome(query)
+
+
+def _do_search_youtube(params: Dict[str, Any]) -> Dict[str, Any]:
+    query = params.get('query', '')
+    if not query:
+        return {'success': False, 'error': 'No search query provided'}
+    return search_youtube(query)
+
+
+def _do_open_app(params: Dict[str, Any]) -> Dict[str, Any]:
+    app_name = params.get('app_name', '')
+    if not app_name:
+        return {'success': False, 'error': 'No application name provided'}
+    return _get_app_tool()._open_app(app_name)
+
+
+def _do_open_website(params: Dict[str, Any]) -> Dict[str, Any]:
+    url = params.get('url', '')
+    if not url:
+        return {'success': False, 'error': 'No URL provided'}
+    return open_website(url)
+
+
+# Command type -> handler taking the parsed params
+_DISPATCH = {
+    'volume_up': lambda params: _get_system_tool()._control_volume('up'),
+    'volume_down': lambda params: _get_system_tool()._control_volume('down'),
+    'volume_mute': lambda params: _get_system_tool()._control_volume('mute'),
+    'volume_unmute': lambda params: _get_system_tool()._control_volume('unmute'),
+    'volume_set': lambda params: _get_system_tool()._control_volume(str(params.get('level', 50))),
+    'open_settings': lambda params: open_settings(),
+    'search_chrome': _do_search_chrome,
+    'search_youtube': _do_search_youtube,
+    'open_app': _do_open_app,
+    'open_website': _do_open_website,
+}
+
 
 class CommandParser:
     """Parse natural language commands"""
     
-    def __init__(self):
-        """Initialize command parser with pattern matching"""
-        self.command_patterns = {
-            # Volume commands
-            'volume_up': [
-                r'(?:increase|raise|turn up|up)\s+(?:the\s+)?volume',
-                r'volume\s+up',
-                r'louder'
-            ],
-            'volume_down': [
-                r'(?:decrease|lower|turn down|down)\s+(?:the\s+)?volume',
-                r'volume\s+down',
-                r'(?:make it\s+)?quieter'
-            ],
-            'volume_mute': [
-                r'mute(?:\s+(?:the\s+)?(?:sound|volume|audio))?',
-                r'silence(?:\s+(?:the\s+)?(?:sound|volume))?'
-            ],
-            'volume_unmute': [
-                r'unmute(?:\s+(?:the\s+)?(?:sound|volume|audio))?',
-                r'turn\s+(?:the\s+)?sound\s+back\s+on'
-            ],
-            'volume_set': [
-                r'(?:set|change)\s+(?:the\s+)?volume\s+to\s+(\d+)',
-                r'volume\s+(\d+)\s*(?:percent|%)?'
-            ],
-            
-            # Settings commands
-            'open_settings': [
-                r'open\s+(?:windows\s+)?settings',
-                r'(?:go|take me)\s+to\s+settings',
-                r'show\s+(?:me\s+)?settings'
-            ],
-            
-            # Search commands
-            'search_chrome': [
-                r'search\s+(?:for\s+)?"?(.+?)"?\s+(?:on|in)\s+(?:chrome|web|google)',
-                r'google\s+"?(.+?)"?',
-                r'search\s+"?(.+?)"?\s+on\s+(?:chrome|web)',
-                r'look up\s+"?(.+?)"?\s+(?:on\s+)?(?:chrome|web)',
-                r'(?:chrome|web)\s+search\s+"?(.+?)"?',
-                r'search\s+(?:the\s+)?(?:web|internet)\s+for\s+"?(.+?)"?'
-            ],
-            'search_youtube': [
-                r'search\s+(?:for\s+)?"?(.+?)"?\s+(?:on|in)\s+youtube',
-                r'(?:find|search)\s+youtube\s+(?:for\s+)?"?(.+?)"?$',
-                r'look up\s+"?(.+?)"?\s+(?:on\s+)?youtube',
-                r'youtube\s+search\s+"?(.+?)"?$',
-                r'"(.+)"\s+search\s+(?:on\s+)?youtube',
-                r'search\s+"(.+)"\s+on\s+youtube'
-            ],
-            
-            # Application commands
-            'open_app': [
-                r'open\s+(.+?)(?:\s+(?:app|application|program))?$',
-                r'launch\s+(.+)',
-                r'start\s+(.+?)(?:\s+(?:app|application))?$'
-            ],
-            
-            # Website commands
-            'open_website': [
-                r'(?:open|go to|visit)\s+(.+?)\s+(?:on\s+)?(?:chrome|browser)',
-                r'visit\s+(?:website\s+)?(.+)',
-                r'(?:open|go to)\s+(?:the\s+)?website\s+(.+)',
-                r'browse\s+(?:to\s+)?(.+\.(?:com|org|net|io|co|in))'
-            ]
-        }
-    
     def parse(self, text: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
         """
         Parse text for commands
@@ -88,26 +179,18 @@ class CommandParser:
         if not text:
             return None, None
         
-        text_lower = text.lower().strip()
+        # Patterns are case-insensitive, so no lowercased copy is needed
+        text = text.strip()
         
-        # Check each command pattern
-        for command_type, patterns in self.command_patterns.items():
+        # Check each command pattern in priority order
+        for command_type, patterns in _PATTERNS:
             for pattern in patterns:
-                match = re.search(pattern, text_lower)
+                match = pattern.search(text)
                 if match:
                     # Extract parameters if any
                     params = {}
-                    if match.groups():
-                        if command_type == 'search_chrome':
-                            params['query'] = match.group(1).strip()
-                        elif command_type == 'search_youtube':
-                            params['query'] = match.group(1).strip()
-                        elif command_type == 'volume_set':
-                            params['level'] = int(match.group(1))
-                        elif command_type == 'open_app':
-                            params['app_name'] = match.group(1).strip()
-                        elif command_type == 'open_website':
-                            params['url'] = match.group(1).strip()
+                    if pattern.groups:
+                        params = _EXTRACTORS[command_type](match.group(1))
                     
                     return command_type, params
         
@@ -115,67 +198,15 @@ class CommandParser:
     
     def execute(self, command_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a parsed command"""
-        from tools.applications import (
-            search_chrome, search_youtube, open_settings, open_website
-        )
-        from tools.system import SystemTool
+        if not HAS_TOOLS:
+            return {'success': False, 'error': 'System tools are not available'}
         
-        try:
-            # Volume commands
-            if command_type.startswith('volume_'):
-                system_tool = SystemTool()
-                
-                if command_type == 'volume_up':
-                    return system_tool._control_volume('up')
-                elif command_type == 'volume_down':
-                    return system_tool._control_volume('down')
-                elif command_type == 'volume_mute':
-                    return system_tool._control_volume('mute')
-                elif command_type == 'volume_unmute':
-                    return system_tool._control_volume('unmute')
-                elif command_type == 'volume_set':
-                    return system_tool._control_volume(str(params.get('level', 50)))
-            
-            # Settings command
-            elif command_type == 'open_settings':
-                return open_settings()
-            
-            # Search commands
-            elif command_type == 'search_chrome':
-                query = params.get('query', '')
-                if query:
-                    return search_chrome(query)
-                else:
-                    return {'success': False, 'error': 'No search query provided'}
-            
-            elif command_type == 'search_youtube':
-                query = params.get('query', '')
-                if query:
-                    return search_youtube(query)
-                else:
-                    return {'success': False, 'error': 'No search query provided'}
-            
-            # Open application
-            elif command_type == 'open_app':
-                from tools.applications import ApplicationTool
-                app_tool = ApplicationTool()
-                app_name = params.get('app_name', '')
-                if app_name:
-                    return app_tool._open_app(app_name)
-                else:
-                    return {'success': False, 'error': 'No application name provided'}
-            
-            # Open website
-            elif command_type == 'open_website':
-                url = params.get('url', '')
-                if url:
-                    return open_website(url)
-                else:
-                    return {'success': False, 'error': 'No URL provided'}
-            
-            else:
-                return {'success': False, 'error': f'Unknown command type: {command_type}'}
+        handler = _DISPATCH.get(command_type)
+        if handler is None:
+            return {'success': False, 'error': f'Unknown command type: {command_type}'}
         
+        try:
+            return handler(params)
         except Exception as e:
             return {'success': False, 'error': f'Command execution error: {str(e)}'}
 
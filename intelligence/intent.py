@@ -5,9 +5,152 @@ Extract structured intent from user input using LLM
 
 import json
 import re
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Set
 from models.base import BaseLLM
 
+# Multi-pattern keyword matching (optional)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    ahocorasick = None
+    HAS_AHOCORASICK = False
+
+
+# Keyword tables for the rule-based extractor
+_OPEN_VERBS = frozenset({'open', 'launch', 'start'})
+_CLOSE_VERBS = frozenset({'close', 'quit', 'exit'})
+_OPEN_APPS = ('chrome', 'firefox', 'notepad', 'calculator', 'explorer')  # checked in order
+_CLOSE_APPS = ('chrome', 'firefox', 'notepad')
+_VOLUME_UP_WORDS = frozenset({'up', 'increase'})
+_VOLUME_DOWN_WORDS = frozenset({'down', 'decrease'})
+_SCREENSHOT_WORDS = frozenset({'screenshot', 'screen shot'})
+_SEARCH_WORDS = frozenset({'search', 'google', 'look up'})
+
+# Search phrases removed from the input to leave the query
+_SEARCH_STRIP_RE = re.compile(r"\b(?:search\s+for|look\s+up|google|search)\b\s*", re.IGNORECASE)
+
+# Every word the extractor reacts to
+_ALL_TRIGGER_WORDS = (
+    _OPEN_VERBS | _CLOSE_VERBS | frozenset(_OPEN_APPS) | {'volume', 'mute'}
+    | _VOLUME_UP_WORDS | _VOLUME_DOWN_WORDS | _SCREENSHOT_WORDS | _SEARCH_WORDS
+)
+
+
+def _build_automaton():
+    """Compile all trigger words into a single Aho-Corasick automaton"""
+    automaton = ahocorasick.Automaton()
+    for word in _ALL_TRIGGER_WORDS:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_AUTOMATON = _build_automaton() if HAS_AHOCORASICK else None
+
+# Text sharing no character with these cannot contain any trigger word
+_TRIGGER_FIRST_CHARS = frozenset(word[0] for word in _ALL_TRIGGER_WORDS)
+
+
+def _find_triggers(text: str) -> Set[str]:
+    """Find every trigger word in text in one pass"""
+    if _AUTOMATON is not None:
+        return {word for _, word in _AUTOMATON.iter(text)}
+    return {word for word in _ALL_TRIGGER_WORDS if word in text}
+
+
+_EMPTY_PARAMETERS = MappingProxyType({})
+
+# Shared read-only intent for input that is not a command
+_CONVERSATION_INTENT = MappingProxyType({
+    'action': 'conversation',
+    'target': '',
+    'parameters': _EMPTY_PARAMETERS,
+    'confidence': 0.5,
+    'is_command': False
+})
+
+
+def _command_intent(action: str, target: str, confidence: float) -> Mapping[str, Any]:
+    """Build a read-only command intent"""
+    return MappingProxyType({
+        'action': action,
+        'target': target,
+        'parameters': _EMPTY_PARAMETERS,
+        'confidence': confidence,
+        'is_command': True
+    })
+
+
+# Placeholder returned by the cached classifier for web searches; the query
+# comes from the original input so that its case is kept
+_SEARCH_INTENT = _command_intent('search_web', '', 0.7)
+
+
+def _rule_based_extraction(user_input: str) -> Mapping[str, Any]:
+    """
+    Simple rule-based intent extraction
+    
+    Every intent returned is read-only.
+    """
+    intent = _classify_normalized(user_input.strip().lower())
+    
+    if intent is _SEARCH_INTENT:
+        # Extract search query
+        query = _SEARCH_STRIP_RE.sub('', user_input).strip()
+        
+        return _command_intent('search_web', query, 0.7)
+    
+    return intent
+
+
+@lru_cache(maxsize=512)
+def _classify_normalized(input_lower: str) -> Mapping[str, Any]:
+    """Classify stripped, lowercased input (cached on that normalized text)"""
+    # Skip keyword matching for text that cannot contain a trigger
+    if _TRIGGER_FIRST_CHARS.isdisjoint(input_lower):
+        return _CONVERSATION_INTENT
+    
+    hits = _find_triggers(input_lower)
+    
+    # Open application
+    if hits & _OPEN_VERBS:
+        for app in _OPEN_APPS:
+            if app in hits:
+                return _command_intent('open_application', app, 0.8)
+    
+    # Close application
+    if hits & _CLOSE_VERBS:
+        for app in _CLOSE_APPS:
+            if app in hits:
+                return _command_intent('close_application', app, 0.8)
+    
+    # Volume control
+    if 'volume' in hits:
+        if hits & _VOLUME_UP_WORDS:
+            target = 'up'
+        elif hits & _VOLUME_DOWN_WORDS:
+            target = 'down'
+        elif 'mute' in hits:
+            target = 'mute'
+        else:
+            target = 'get'
+        
+        return _command_intent('control_volume', target, 0.9)
+    
+    # Screenshot
+    if hits & _SCREENSHOT_WORDS:
+        return _command_intent('take_screenshot', '', 0.9)
+    
+    # Web search
+    if hits & _SEARCH_WORDS:
+        return _SEARCH_INTENT
+    
+    # Not a command
+    return _CONVERSATION_INTENT
+
 
 class IntentExtractor:
     """Extract intent from user input"""
@@ -21,7 +164,7 @@ class IntentExtractor:
         """
         self.llm = llm
     
-    def extract(self, user_input: str) -> Dict[str, Any]:
+    def extract(self, user_input: str) -> Mapping[str, Any]:
         """
         Extract intent from user input using rule-based detection
         
@@ -35,90 +178,10 @@ class IntentExtractor:
                 - parameters: dict
                 - confidence: float (0.0 - 1.0)
                 - is_command: bool
+            The intent is a read-only mapping shared between repeated inputs.
         """
         # Use rule-based extraction (fast and reliable)
-        return self._rule_based_extraction(user_input)
-    
-    def _rule_based_extraction(self, user_input: str) -> Dict[str, Any]:
-        """Simple rule-based intent extraction"""
-        input_lower = user_input.lower()
-        
-        # Open application
-        if any(word in input_lower for word in ['open', 'launch', 'start']):
-            for app in ['chrome', 'firefox', 'notepad', 'calculator', 'explorer']:
-                if app in input_lower:
-                    return {
-                        'action': 'open_application',
-                        'target': app,
-                        'parameters': {},
-                        'confidence': 0.8,
-                        'is_command': True
-                    }
-        
-        # Close application
-        if any(word in input_lower for word in ['close', 'quit', 'exit']):
-            for app in ['chrome', 'firefox', 'notepad']:
-                if app in input_lower:
-                    return {
-                        'action': 'close_application',
-                        'target': app,
-                        'parameters': {},
-                        'confidence': 0.8,
-                        'is_command': True
-                    }
-        
-        # Volume control
-        if 'volume' in input_lower:
-            if 'up' in input_lower or 'increase' in input_lower:
-                target = 'up'
-            elif 'down' in input_lower or 'decrease' in input_lower:
-                target = 'down'
-            elif 'mute' in input_lower:
-                target = 'mute'
-            else:
-                target = 'get'
-            
-            return {
-                'action': 'control_volume',
-                'target': target,
-                'parameters': {},
-                'confidence': 0.9,
-                'is_command': True
-            }
-        
-        # Screenshot
-        if 'screenshot' in input_lower or 'screen shot' in input_lower:
-            return {
-                'action': 'take_screenshot',
-                'target': '',
-                'parameters': {},
-                'confidence': 0.9,
-                'is_command': True
-            }
-        
-        # Web search
-        if any(word in input_lower for word in ['search', 'google', 'look up']):
-            # Extract search query
-            query = user_input
-            for word in ['search for', 'google', 'look up', 'search']:
-                query = query.replace(word, '').strip()
-            
-            return {
-                'action': 'search_web',
-                'target': query,
-                'parameters': {},
-                'confidence': 0.7,
-                'is_command': True
-            }
-        
-        # Not a command
-        return {
-            'action': 'conversation',
-            'target': '',
-            'parameters': {},
-            'confidence': 0.5,
-            'is_command': False
-        }
+        return _rule_based_extraction(user_input)
     
     def _llm_based_extraction(self, user_input: str) -> Dict[str, Any]:
         """LLM-based intent extraction"""
@@ -179,4 +242,4 @@ if __name__ == "__main__":
     for inp in test_inputs:
         intent = extractor.extract(inp)
         print(f"\nInput: {inp}")
-        print(f"Intent: {json.dumps(intent, indent=2)}")
+        print(f"Intent: {json.dumps(intent, indent=2, default=dict)}")
@@ -3,25 +3,25 @@ Safety Validator
 Validate and confirm dangerous actions
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, FrozenSet
 
 
 class SafetyValidator:
     """Validate tool execution for safety"""
     
     # Dangerous actions that require confirmation
-    DANGEROUS_ACTIONS = [
+    DANGEROUS_ACTIONS: FrozenSet[str] = frozenset({
         'delete_file',
         'close_application',
         'shutdown',
         'restart'
-    ]
+    })
     
     # Actions that should never be auto-executed
-    FORBIDDEN_ACTIONS = [
+    FORBIDDEN_ACTIONS: FrozenSet[str] = frozenset({
         'format_disk',
         'delete_system_file'
-    ]
+    })
     
     def __init__(self, require_confirmation: bool = True):
         """
@@ -18,6 +18,7 @@ Setup:
 No internet required. Complete privacy.
 """
 
+import logging
 import sys
 import os
 
@@ -28,6 +29,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from gui import main
 
 if __name__ == "__main__":
+    # The models package reports loading and errors through logging
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logging.getLogger("models").setLevel(logging.INFO)
+    
     print("=" * 60)
     print("Smart Assistant - 100% Offline AI Assistant")
     print("=" * 60)
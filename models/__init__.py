@@ -3,6 +3,8 @@ Smart Assistant Model Abstraction Layer (Offline Only)
 Local GGUF models support
 """
 
+import logging
+
 from .base import BaseLLM
 from .router import ModelRouter
 from .registry import ModelRegistry
@@ -15,6 +17,9 @@ except ImportError:
     LocalModel = None
     HAS_LOCAL_MODEL = False
 
+# Silent unless the application configures logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 __all__ = [
     'BaseLLM',
     'LocalModel',
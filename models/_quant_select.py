@@ -0,0 +1,72 @@
+"""
+Quantization Selection
+Pick the GGUF quantization that best matches the host CPU's instruction set
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
+
+# Cross-platform CPU flag detection (optional, used when /proc/cpuinfo is absent)
+try:
+    import cpuinfo
+    HAS_CPUINFO = True
+except ImportError:
+    cpuinfo = None
+    HAS_CPUINFO = False
+
+
+# Quant tag in a GGUF filename, e.g. "codellama-7b-instruct.Q4_K_M.gguf"
+_QUANT_RE = re.compile(r'(I?Q\d+_(?:K_[SML]|K|NL|XXS|XS|[01])|BF16|F16|F32)', re.IGNORECASE)
+
+# Preferred quants per instruction set, best first
+_VNNI_QUANTS = ('Q8_0', 'IQ4_NL', 'Q4_K_M')  # int8 VNNI dot products
+_AVX2_QUANTS = ('Q4_K_M', 'Q4_0')
+_AVX_QUANTS = ('Q4_0', 'Q4_K_M')
+
+
+def _normalize_flags(flags) -> FrozenSet[str]:
+    """Lowercase flag names and drop '_' ('avx512_vnni' and 'avx512vnni' match)"""
+    return frozenset(flag.lower().replace('_', '') for flag in flags)
+
+
+@lru_cache(maxsize=1)
+def cpu_flags() -> FrozenSet[str]:
+    """Get the host CPU feature flags (normalized, e.g. 'avx2', 'avx512vnni')"""
+    if os.path.exists('/proc/cpuinfo'):
+        try:
+            with open('/proc/cpuinfo', 'r') as f:
+                for line in f:
+                    if line.startswith('flags'):
+                        return _normalize_flags(line.split(':', 1)[1].split())
+        except OSError:
+            pass
+
+    if HAS_CPUINFO:
+        try:
+            return _normalize_flags(cpuinfo.get_cpu_info().get('flags', ()))
+        except Exception:
+            pass
+
+    return frozenset()
+
+
+def preferred_quants() -> Tuple[str, ...]:
+    """Get quantization types in order of preference for this CPU"""
+    flags = cpu_flags()
+    if 'avx512vnni' in flags:
+        return _VNNI_QUANTS
+    if 'avx2' in flags:
+        return _AVX2_QUANTS
+    if 'avx' in flags:
+        return _AVX_QUANTS
+    return ()
+
+
+def quant_of(model_path: Optional[str]) -> Optional[str]:
+    """Get the quantization tag from a GGUF filename, if it has one"""
+    if not model_path:
+        return None
+    match = _QUANT_RE.search(os.path.basename(model_path))
+    return match.group(1).upper() if match else None
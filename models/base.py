@@ -4,20 +4,27 @@ Abstract base class for all LLM implementations
 """
 
 from abc import ABC, abstractmethod
-from typing import Iterator, Dict, Any, Optional
+from types import MappingProxyType
+from typing import Iterator, Dict, Any, Mapping, Optional
 
 
 class BaseLLM(ABC):
     """Abstract base class for LLM implementations"""
     
+    # Subclasses should declare __slots__ too, listing their own attributes
+    __slots__ = ('model_name', 'is_online', 'capabilities')
+    
+    # Shared read-only capabilities; subclasses override the class constant
+    _DEFAULT_CAPABILITIES: Mapping[str, bool] = MappingProxyType({
+        'streaming': False,
+        'function_calling': False,
+        'vision': False
+    })
+    
     def __init__(self, model_name: str):
         self.model_name = model_name
         self.is_online = False
-        self.capabilities = {
-            'streaming': False,
-            'function_calling': False,
-            'vision': False
-        }
+        self.capabilities = self._DEFAULT_CAPABILITIES
     
     @abstractmethod
     def generate(self, prompt: str, **kwargs) -> str:
@@ -67,7 +74,7 @@ class BaseLLM(ABC):
         return {
             'name': self.model_name,
             'is_online': self.is_online,
-            'capabilities': self.capabilities,
+            'capabilities': dict(self.capabilities),
             'available': self.is_available()
         }
     
@@ -3,32 +3,208 @@ Local GGUF Model Implementation
 Offline LLM using llama-cpp-python
 """
 
+import logging
+import mmap
 import os
-from typing import Iterator, Optional
+import struct
+import threading
+import weakref
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
 
+# Prefer the tensor-core wheel (cuBLAS matmul path on RTX GPUs) when installed
 try:
-    from llama_cpp import Llama
+    from llama_cpp_cuda_tensorcores import Llama
     HAS_LLAMA_CPP = True
 except ImportError:
-    Llama = None
-    HAS_LLAMA_CPP = False
+    try:
+        from llama_cpp import Llama
+        HAS_LLAMA_CPP = True
+    except ImportError:
+        Llama = None
+        HAS_LLAMA_CPP = False
+
+# GPU memory query for auto-sizing the GPU offload (optional)
+try:
+    import pynvml
+    HAS_PYNVML = True
+except ImportError:
+    pynvml = None
+    HAS_PYNVML = False
 
 from .base import BaseLLM
 
 
+log = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# VRAM kept free for the CUDA context and compute buffers
+VRAM_RESERVE_MB = 512
+
+# KV cache types: (ggml type id, bytes per element)
+KV_CACHE_TYPES = MappingProxyType({
+    'f16': (1, 2.0),
+    'q4_0': (2, 18 / 32),
+    'q8_0': (8, 34 / 32),
+})
+
+# Shortest context worth quantizing the KV cache for
+KV_QUANT_MIN_CONTEXT = 4096
+
+# Tokens buffered per chunk yielded by stream_generate
+STREAM_CHUNK_TOKENS = 8
+
+
+class _PooledLlama:
+    """A loaded model plus the lock that serializes calls into it"""
+    
+    __slots__ = ('llama', 'gpu_layers', 'kv_quant', 'lock', '__weakref__')
+    
+    def __init__(self, llama: "Llama", gpu_layers: int, kv_quant: str):
+        self.llama = llama
+        # Resolved layer count, reused by wrappers that asked for auto
+        self.gpu_layers = gpu_layers
+        # KV cache type actually loaded (f16 after a fallback)
+        self.kv_quant = kv_quant
+        # Llama is not thread-safe: held for warmup and every generation
+        self.lock = threading.Lock()
+
+
+# Loaded models shared between LocalModel wrappers with the same load settings;
+# an entry is freed once the last wrapper using it lets go
+_LLAMA_POOL: "weakref.WeakValueDictionary[tuple, _PooledLlama]" = weakref.WeakValueDictionary()
+
+
+def _free_vram_mb(device_index: int = 0) -> Optional[float]:
+    """Free memory on a GPU in MB, or None if it cannot be queried"""
+    if not HAS_PYNVML:
+        return None
+    
+    try:
+        pynvml.nvmlInit()
+        try:
+            handle = pynvml.nvmlDeviceGetHandleByIndex(device_index)
+            return pynvml.nvmlDeviceGetMemoryInfo(handle).free / MB
+        finally:
+            pynvml.nvmlShutdown()
+    except pynvml.NVMLError:
+        return None
+
+
+GGUF_MAGIC = 0x46554747  # b"GGUF" little-endian
+
+# GGUF metadata value types: struct format for fixed-size scalars
+_GGUF_SCALARS = {
+    0: '<B', 1: '<b', 2: '<H', 3: '<h', 4: '<I', 5: '<i',
+    6: '<f', 7: '<?', 10: '<Q', 11: '<q', 12: '<d'
+}
+_GGUF_STRING = 8
+_GGUF_ARRAY = 9
+
+
+def _gguf_string(mm: mmap.mmap, offset: int) -> Tuple[str, int]:
+    """Read a length-prefixed GGUF string, returning (value, next offset)"""
+    (length,) = struct.unpack_from('<Q', mm, offset)
+    offset += 8
+    return mm[offset:offset + length].decode('utf-8', errors='replace'), offset + length
+
+
+def _gguf_skip_array(mm: mmap.mmap, offset: int) -> int:
+    """Skip over a GGUF array value, returning the next offset"""
+    item_type, count = struct.unpack_from('<IQ', mm, offset)
+    offset += 12
+    if item_type in _GGUF_SCALARS:
+        return offset + count * struct.calcsize(_GGUF_SCALARS[item_type])
+    for _ in range(count):
+        if item_type == _GGUF_STRING:
+            (length,) = struct.unpack_from('<Q', mm, offset)
+            offset += 8 + length
+        elif item_type == _GGUF_ARRAY:
+            offset = _gguf_skip_array(mm, offset)
+        else:
+            raise ValueError(f"Unknown GGUF value type: {item_type}")
+    return offset
+
+
+@lru_cache(maxsize=32)
+def _parse_gguf_header(model_path: str, mtime: float) -> Optional[Dict[str, Any]]:
+    """
+    Parse a GGUF header and its scalar metadata
+    
+    The file is memory-mapped, so only the pages holding the header are read.
+    Cached per (path, mtime) so a changed file is parsed again.
+    
+    Returns:
+        Dict with version, tensor_count, kv_count and metadata (arrays are
+        skipped), or None if the file is not GGUF v2+
+    """
+    with open(model_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, tensor_count, kv_count = struct.unpack_from('<IIQQ', mm, 0)
+            if magic != GGUF_MAGIC or version < 2:
+                return None
+            
+            metadata = {}
+            offset = 24
+            for _ in range(kv_count):
+                key, offset = _gguf_string(mm, offset)
+                (value_type,) = struct.unpack_from('<I', mm, offset)
+                offset += 4
+                
+                if value_type in _GGUF_SCALARS:
+                    fmt = _GGUF_SCALARS[value_type]
+                    (metadata[key],) = struct.unpack_from(fmt, mm, offset)
+                    offset += struct.calcsize(fmt)
+                elif value_type == _GGUF_STRING:
+                    metadata[key], offset = _gguf_string(mm, offset)
+                elif value_type == _GGUF_ARRAY:
+                    offset = _gguf_skip_array(mm, offset)
+                else:
+                    raise ValueError(f"Unknown GGUF value type: {value_type}")
+    
+    return {
+        'version': version,
+        'tensor_count': tensor_count,
+        'kv_count': kv_count,
+        'metadata': MappingProxyType(metadata)
+    }
+
 
 class LocalModel(BaseLLM):
     """Local GGUF model using llama-cpp-python"""
     
+    __slots__ = (
+        'model_path', 'use_gpu', 'gpu_layers', 'context_size', 'batch_size',
+        'ubatch_size', 'n_threads', 'n_threads_batch', 'offload_kqv', 'kv_quant',
+        'tensor_split', 'main_gpu', 'temperature', 'max_tokens', 'model',
+        '_pooled', '_pool_key'
+    )
+    
+    _DEFAULT_CAPABILITIES = MappingProxyType({
+        **BaseLLM._DEFAULT_CAPABILITIES,
+        'streaming': True
+    })
+    
     def __init__(
         self,
         model_path: str,
         model_name: Optional[str] = None,
         use_gpu: bool = True,
-        gpu_layers: int = 35,
+        gpu_layers: Optional[int] = None,
         context_size: int = 4096,
         temperature: float = 0.7,
-        max_tokens: int = 512
+        max_tokens: int = 512,
+        batch_size: int = 512,
+        tensor_split: Optional[List[float]] = None,
+        main_gpu: int = 0,
+        ubatch_size: int = 512,
+        n_threads: Optional[int] = None,
+        n_threads_batch: Optional[int] = None,
+        offload_kqv: Optional[bool] = None,
+        kv_quant: Literal['f16', 'q8_0', 'q4_0'] = 'q8_0',
+        warmup: bool = True
     ):
         """
         Initialize local GGUF model
@@ -37,10 +213,23 @@ class LocalModel(BaseLLM):
             model_path: Path to .gguf file
             model_name: Display name (defaults to filename)
             use_gpu: Enable GPU acceleration
-            gpu_layers: Number of layers to offload to GPU
+            gpu_layers: Number of layers to offload to GPU (-1 = all,
+                None = as many as fit in free VRAM)
             context_size: Context window size
             temperature: Sampling temperature
             max_tokens: Max tokens per response
+            batch_size: Prompt processing batch size
+            tensor_split: Fraction of the model to put on each GPU
+            main_gpu: GPU used for scratch buffers and small tensors
+            ubatch_size: Physical batch size for prompt processing
+            n_threads: CPU threads for generation (None = all cores but one,
+                or two when layers are offloaded to the GPU)
+            n_threads_batch: CPU threads for prompt processing (None = n_threads)
+            offload_kqv: Keep the KV cache on the GPU (None = use_gpu)
+            kv_quant: KV cache type when running on the GPU with a context of
+                at least 4096 tokens ('f16', 'q8_0' or 'q4_0')
+            warmup: Run a 1-token generation in the background after loading
+                so the first real request skips GPU/kernel initialisation
         """
         if model_name is None:
             model_name = os.path.basename(model_path)
@@ -49,41 +238,215 @@ class LocalModel(BaseLLM):
         
         self.model_path = model_path
         self.use_gpu = use_gpu
-        self.gpu_layers = gpu_layers if use_gpu else 0
         self.context_size = context_size
+        if not use_gpu or context_size < KV_QUANT_MIN_CONTEXT:
+            kv_quant = 'f16'
+        elif kv_quant not in KV_CACHE_TYPES:
+            raise ValueError(f"Unknown kv_quant: {kv_quant}")
+        self.kv_quant = kv_quant
+        self.batch_size = batch_size
+        self.tensor_split = tensor_split
+        self.main_gpu = main_gpu
+        self.ubatch_size = ubatch_size
+        self.offload_kqv = use_gpu if offload_kqv is None else offload_kqv
+        
+        if not use_gpu:
+            gpu_layers = 0
+        
+        # Pool key from the requested settings (gpu_layers None = auto): the
+        # auto layer count shrinks once a first copy holds VRAM, so keying on
+        # the resolved count would load a second copy
+        self._pool_key = (
+            model_path, context_size, gpu_layers, batch_size, ubatch_size,
+            n_threads, n_threads_batch, self.offload_kqv, kv_quant,
+            tuple(tensor_split) if tensor_split else None, main_gpu
+        )
+        
+        pooled = _LLAMA_POOL.get(self._pool_key)
+        if pooled is not None:
+            self.gpu_layers = pooled.gpu_layers
+        elif gpu_layers is None:
+            self.gpu_layers = self._auto_gpu_layers()
+        else:
+            self.gpu_layers = gpu_layers
+        
+        if n_threads is None:
+            n_threads = max(1, (os.cpu_count() or 4) - (2 if self.gpu_layers != 0 else 1))
+        self.n_threads = n_threads
+        self.n_threads_batch = n_threads_batch or n_threads
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.is_online = False
         
-        self.capabilities = {
-            'streaming': True,
-            'function_calling': False,
-            'vision': False
-        }
-        
         self.model: Optional[Llama] = None
-        self._load_model()
+        self._pooled: Optional[_PooledLlama] = None
+        self._load_model(warmup)
     
-    def _load_model(self):
-        """Load the GGUF model"""
+    @staticmethod
+    def _gguf_header(model_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the parsed GGUF header for a model file
+        
+        Args:
+            model_path: Path to .gguf file
+        
+        Returns:
+            Header dict (see _parse_gguf_header), or None if unreadable
+        """
         try:
-            print(f"Loading local model: {self.model_name}")
-            print(f"  Path: {self.model_path}")
-            print(f"  GPU Layers: {self.gpu_layers}")
+            return _parse_gguf_header(model_path, os.stat(model_path).st_mtime)
+        except (OSError, ValueError, struct.error):
+            return None
+    
+    def _gguf_layout(self) -> Optional[Tuple[int, int]]:
+        """
+        Get (block_count, kv_width) from the model's metadata
+        
+        kv_width is the per-token width of the K (or V) cache of one layer:
+        embedding_length scaled by head_count_kv / head_count, so models
+        with grouped-query attention (e.g. 8 KV heads for 32 heads) are not
+        charged for a full-width cache.
+        """
+        header = self._gguf_header(self.model_path)
+        if header is None:
+            return None
+        
+        metadata = header['metadata']
+        arch = metadata.get('general.architecture')
+        try:
+            block_count = int(metadata[f'{arch}.block_count'])
+            kv_width = int(metadata[f'{arch}.embedding_length'])
+        except KeyError:
+            return None
+        
+        # Per-layer head counts are stored as arrays (skipped); assume no GQA then
+        head_count = metadata.get(f'{arch}.attention.head_count')
+        head_count_kv = metadata.get(f'{arch}.attention.head_count_kv')
+        if isinstance(head_count, int) and isinstance(head_count_kv, int) and head_count > 0:
+            kv_width = kv_width * head_count_kv // head_count
+        
+        return block_count, kv_width
+    
+    def _auto_gpu_layers(self) -> int:
+        """
+        Offload as many layers as fit in free VRAM
+        
+        Returns:
+            Layer count, or -1 to offload everything (also used when VRAM
+            or the model layout cannot be read)
+        """
+        free_mb = _free_vram_mb(self.main_gpu)
+        layout = self._gguf_layout()
+        if free_mb is None or layout is None:
+            return -1
+        
+        block_count, kv_width = layout
+        
+        # Weights are mostly in the repeating blocks; K and V cache per layer
+        per_layer_mb = os.path.getsize(self.model_path) / block_count / MB
+        kv_bytes = KV_CACHE_TYPES[self.kv_quant][1]
+        kv_per_layer_mb = 2 * self.context_size * kv_width * kv_bytes / MB
+        
+        layers = int((free_mb - VRAM_RESERVE_MB) / (per_layer_mb + kv_per_layer_mb))
+        layers = max(layers, 0)
+        log.info("Auto GPU layers: %d/%d (%.0f MB VRAM free)",
+                 min(layers, block_count), block_count, free_mb)
+        
+        return -1 if layers >= block_count else layers
+    
+    def _load_model(self, warmup: bool = False):
+        """
+        Load the GGUF model
+        
+        Args:
+            warmup: Start a background warmup generation if the model is
+                freshly loaded rather than reused from the pool
+        """
+        try:
+            log.info("Loading local model: %s (path: %s, GPU layers: %s)",
+                     self.model_name, self.model_path, self.gpu_layers)
+            
+            pooled = _LLAMA_POOL.get(self._pool_key)
+            if pooled is not None:
+                self._pooled = pooled
+                self.model = pooled.llama
+                self.kv_quant = pooled.kv_quant
+                log.info("Reusing loaded model: %s", self.model_name)
+                return
+            
+            try:
+                model = self._create_llama(self.kv_quant)
+            except Exception as e:
+                if self.kv_quant == 'f16':
+                    raise
+                # Backend or GPU without quantized KV / flash attention support
+                log.warning("Load with %s KV cache failed (%s), retrying with f16",
+                            self.kv_quant, e)
+                self.kv_quant = 'f16'
+                model = self._create_llama('f16')
+            
+            pooled = _PooledLlama(model, self.gpu_layers, self.kv_quant)
+            _LLAMA_POOL[self._pool_key] = pooled
+            self._pooled = pooled
+            self.model = model
             
-            self.model = Llama(
-                model_path=self.model_path,
-                n_gpu_layers=self.gpu_layers,
-                n_ctx=self.context_size,
-                verbose=False
-            )
+            log.info("Model loaded: %s", self.model_name)
             
-            print(f"✅ Model loaded successfully!")
+            if warmup:
+                # Taken here so the warmup runs before any wrapper's first call
+                pooled.lock.acquire()
+                threading.Thread(target=self._warmup, args=(pooled,), daemon=True).start()
             
         except Exception as e:
-            print(f"❌ Failed to load model: {e}")
+            log.error("Failed to load model %s: %s", self.model_name, e)
             self.model = None
     
+    def _create_llama(self, kv_quant: str) -> "Llama":
+        """
+        Create the llama.cpp model
+        
+        Args:
+            kv_quant: KV cache type; anything but 'f16' also enables flash
+                attention, which a quantized V cache requires
+        """
+        kv_kwargs = {}
+        if kv_quant != 'f16':
+            kv_type = KV_CACHE_TYPES[kv_quant][0]
+            kv_kwargs = {'type_k': kv_type, 'type_v': kv_type, 'flash_attn': True}
+        
+        return Llama(
+            model_path=self.model_path,
+            n_gpu_layers=self.gpu_layers,
+            n_ctx=self.context_size,
+            n_batch=self.batch_size,
+            n_ubatch=self.ubatch_size,
+            n_threads=self.n_threads,
+            n_threads_batch=self.n_threads_batch,
+            offload_kqv=self.offload_kqv,
+            tensor_split=self.tensor_split,
+            main_gpu=self.main_gpu,
+            logits_all=False,
+            embedding=False,
+            use_mmap=True,
+            use_mlock=False,
+            verbose=False,
+            **kv_kwargs
+        )
+    
+    @staticmethod
+    def _warmup(pooled: _PooledLlama):
+        """
+        Generate a single token to initialise the backend
+        
+        Runs with pooled.lock already held and releases it when done.
+        """
+        try:
+            pooled.llama("hi", max_tokens=1, temperature=0)
+        except Exception:
+            pass
+        finally:
+            pooled.lock.release()
+    
     def is_available(self) -> bool:
         """Check if model is loaded and ready"""
         return self.model is not None and os.path.exists(self.model_path)
@@ -106,18 +469,20 @@ class LocalModel(BaseLLM):
         max_tokens = kwargs.get('max_tokens', self.max_tokens)
         
         try:
-            response = self.model(
-                prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                stop=["</s>", "User:", "Human:"],
-                echo=False
-            )
+            # Waits for the warmup and for other wrappers sharing the model
+            with self._pooled.lock:
+                response = self.model(
+                    prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stop=["</s>", "User:", "Human:"],
+                    echo=False
+                )
             
             return response['choices'][0]['text'].strip()
             
         except Exception as e:
-            print(f"❌ Generation error: {e}")
+            log.error("Generation error: %s", e)
             return f"Error: {str(e)}"
     
     def stream_generate(self, prompt: str, **kwargs) -> Iterator[str]:
@@ -138,34 +503,49 @@ class LocalModel(BaseLLM):
         max_tokens = kwargs.get('max_tokens', self.max_tokens)
         
         try:
-            stream = self.model(
-                prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                stop=["</s>", "User:", "Human:"],
-                stream=True,
-                echo=False
-            )
-            
-            for chunk in stream:
-                text = chunk['choices'][0]['text']
-                if text:
-                    yield text
+            # Held until the stream is exhausted or closed
+            with self._pooled.lock:
+                stream = self.model(
+                    prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stop=["</s>", "User:", "Human:"],
+                    stream=True,
+                    echo=False
+                )
+                
+                # Hand tokens to the consumer in small batches, flushing at line ends
+                buffer = []
+                for chunk in stream:
+                    text = chunk['choices'][0]['text']
+                    if text:
+                        buffer.append(text)
+                        if len(buffer) >= STREAM_CHUNK_TOKENS or '\n' in text:
+                            yield ''.join(buffer)
+                            buffer.clear()
+                
+                if buffer:
+                    yield ''.join(buffer)
                     
         except Exception as e:
-            print(f"❌ Streaming error: {e}")
+            log.error("Streaming error: %s", e)
             yield f"Error: {str(e)}"
     
     def unload(self):
-        """Unload model from memory"""
+        """
+        Release this wrapper's model
+        
+        Memory is freed once no other wrapper shares the same loaded model.
+        """
         if self.model:
-            del self.model
             self.model = None
-            print(f"Model {self.model_name} unloaded")
+            self._pooled = None
+            log.info("Model %s unloaded", self.model_name)
 
 
 if __name__ == "__main__":
     # Test local model
+    logging.basicConfig(level=logging.INFO)
     model_path = r"C:\Users\JATOTHU ANAND\Desktop\Smart Real-time Unified Tool for Human-AI Interaction sruthi-ai\assistant\codellama-7b-instruct.Q4_K_M.gguf"
     
     if os.path.exists(model_path):
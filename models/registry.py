@@ -4,10 +4,25 @@ CRUD operations for managing models
 """
 
 import json
+import logging
 import os
+from contextlib import contextmanager
 from typing import Dict, List, Optional
 from pathlib import Path
 
+# Fast JSON encoding (optional)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+from ._quant_select import preferred_quants, quant_of
+
+
+log = logging.getLogger(__name__)
+
 
 class ModelRegistry:
     """Manage registered models with persistence"""
@@ -26,7 +41,14 @@ class ModelRegistry:
         
         self.registry_file = registry_file
         self.models: Dict[str, Dict] = {}
+        self._dirty = False
+        self._batch_depth = 0
         self._load()
+        
+        # Model keys per type and the default key per type, kept in step with self.models
+        self._by_type: Dict[str, List[str]] = {}
+        self._defaults: Dict[str, str] = {}
+        self._build_index()
     
     def _load(self):
         """Load registry from file"""
@@ -34,21 +56,79 @@ class ModelRegistry:
             try:
                 with open(self.registry_file, 'r') as f:
                     self.models = json.load(f)
-                print(f"✅ Loaded {len(self.models)} models from registry")
+                log.info("Loaded %d models from registry", len(self.models))
             except Exception as e:
-                print(f"⚠️ Failed to load registry: {e}")
+                log.warning("Failed to load registry: %s", e)
                 self.models = {}
         else:
             self.models = {}
+            self._dirty = True
             self._save()
     
     def _save(self):
-        """Save registry to file"""
+        """Save registry to file if it has unsaved changes"""
+        if not self._dirty:
+            return
+        
+        # Write a temp file and swap it in so a crash never leaves a partial registry
+        tmp_file = self.registry_file + '.tmp'
         try:
-            with open(self.registry_file, 'w') as f:
-                json.dump(self.models, f, indent=2)
-        except Exception as e:
-            print(f"❌ Failed to save registry: {e}")
+            if HAS_ORJSON:
+                data = orjson.dumps(self.models, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.models, indent=2).encode('utf-8')
+            
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.registry_file)
+            self._dirty = False
+        except (OSError, TypeError, ValueError):
+            # Write failure or a value that can't be encoded (orjson's
+            # JSONEncodeError is a TypeError)
+            log.exception("Failed to save registry")
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+    
+    def _changed(self):
+        """Mark unsaved changes and write them, unless inside batch()"""
+        self._dirty = True
+        if not self._batch_depth:
+            self._save()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group several edits into a single write
+        
+        Usage:
+            with registry.batch():
+                registry.add_model(...)
+                registry.set_default(...)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._save()
+    
+    def flush(self):
+        """Write pending changes to the registry file"""
+        self._save()
+    
+    def _build_index(self):
+        """Rebuild the per-type indexes from self.models"""
+        self._by_type = {}
+        self._defaults = {}
+        for key, info in self.models.items():
+            self._by_type.setdefault(info['type'], []).append(key)
+            if info.get('is_default'):
+                self._defaults.setdefault(info['type'], key)
     
     def add_model(
         self,
@@ -70,13 +150,14 @@ class ModelRegistry:
             model_name: Model name (e.g., 'gpt-4', 'gemini-pro')
             api_key: API key (for online models)
             is_default: Set as default for this type
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters (e.g. quant, otherwise read
+                from the GGUF filename)
         
         Returns:
             True if successful
         """
         if key in self.models:
-            print(f"⚠️ Model '{key}' already exists. Use update_model() instead.")
+            log.warning("Model '%s' already exists. Use update_model() instead.", key)
             return False
         
         model_info = {
@@ -87,13 +168,17 @@ class ModelRegistry:
             'api_key': api_key,
             'is_default': is_default,
             'is_online': model_type != 'local',
+            'quant': quant_of(model_path),
             **kwargs
         }
         
         self.models[key] = model_info
-        self._save()
+        self._by_type.setdefault(model_type, []).append(key)
+        if is_default:
+            self._defaults.setdefault(model_type, key)
+        self._changed()
         
-        print(f"✅ Added model: {key} ({model_type})")
+        log.info("Added model: %s (%s)", key, model_type)
         return True
     
     def get_model(self, key: str) -> Optional[Dict]:
@@ -111,10 +196,7 @@ class ModelRegistry:
             List of model info dicts
         """
         if model_type:
-            return [
-                info for info in self.models.values()
-                if info['type'] == model_type
-            ]
+            return [self.models[key] for key in self._by_type.get(model_type, ())]
         return list(self.models.values())
     
     def update_model(self, key: str, **updates) -> bool:
@@ -129,13 +211,15 @@ class ModelRegistry:
             True if successful
         """
         if key not in self.models:
-            print(f"❌ Model '{key}' not found")
+            log.error("Model '%s' not found", key)
             return False
         
         self.models[key].update(updates)
-        self._save()
+        if 'type' in updates or 'is_default' in updates:
+            self._build_index()
+        self._changed()
         
-        print(f"✅ Updated model: {key}")
+        log.info("Updated model: %s", key)
         return True
     
     def remove_model(self, key: str) -> bool:
@@ -149,13 +233,27 @@ class ModelRegistry:
             True if successful
         """
         if key not in self.models:
-            print(f"❌ Model '{key}' not found")
+            log.error("Model '%s' not found", key)
             return False
         
-        del self.models[key]
-        self._save()
+        info = self.models.pop(key)
+        model_type = info['type']
         
-        print(f"✅ Removed model: {key}")
+        keys = self._by_type[model_type]
+        keys.remove(key)
+        if not keys:
+            del self._by_type[model_type]
+        
+        if self._defaults.get(model_type) == key:
+            del self._defaults[model_type]
+            for k in keys:
+                if self.models[k].get('is_default'):
+                    self._defaults[model_type] = k
+                    break
+        
+        self._changed()
+        
+        log.info("Removed model: %s", key)
         return True
     
     def set_default(self, key: str) -> bool:
@@ -169,56 +267,52 @@ class ModelRegistry:
             True if successful
         """
         if key not in self.models:
-            print(f"❌ Model '{key}' not found")
+            log.error("Model '%s' not found", key)
             return False
         
         model_type = self.models[key]['type']
         
         # Unset other defaults of same type
-        for k, info in self.models.items():
-            if info['type'] == model_type:
-                info['is_default'] = (k == key)
+        for k in self._by_type[model_type]:
+            self.models[k]['is_default'] = (k == key)
+        self._defaults[model_type] = key
         
-        self._save()
-        print(f"✅ Set {key} as default {model_type} model")
+        self._changed()
+        log.info("Set %s as default %s model", key, model_type)
         return True
     
     def get_default(self, model_type: str) -> Optional[Dict]:
         """Get default model for type"""
-        for info in self.models.values():
-            if info['type'] == model_type and info.get('is_default'):
-                return info
+        if model_type in self._defaults:
+            return self.models[self._defaults[model_type]]
         
-        # If no default, return first of type
         models = self.list_models(model_type)
+        
+        # If no default, prefer the local quant that suits this CPU
+        if model_type == 'local':
+            for quant in preferred_quants():
+                for info in models:
+                    if (info.get('quant') or quant_of(info.get('model_path'))) == quant:
+                        return info
+        
+        # Otherwise return first of type
         return models[0] if models else None
     
     def get_stats(self) -> Dict:
         """Get registry statistics"""
-        stats = {
+        online = sum(1 for info in self.models.values() if info['is_online'])
+        
+        return {
             'total': len(self.models),
-            'local': 0,
-            'online': 0,
-            'by_type': {}
+            'local': len(self.models) - online,
+            'online': online,
+            'by_type': {t: len(keys) for t, keys in self._by_type.items()}
         }
-        
-        for info in self.models.values():
-            model_type = info['type']
-            
-            if info['is_online']:
-                stats['online'] += 1
-            else:
-                stats['local'] += 1
-            
-            if model_type not in stats['by_type']:
-                stats['by_type'][model_type] = 0
-            stats['by_type'][model_type] += 1
-        
-        return stats
 
 
 if __name__ == "__main__":
     # Test registry
+    logging.basicConfig(level=logging.INFO)
     registry = ModelRegistry()
     
     # Add some test models
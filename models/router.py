@@ -3,10 +3,30 @@ Model Router - 100% Offline
 Routes all requests to local GGUF model only
 """
 
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Optional, Dict, Mapping
 from .base import BaseLLM
 from .local_model import LocalModel
 
+# Multi-pattern keyword matching (optional)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    ahocorasick = None
+    HAS_AHOCORASICK = False
+
+
+def _build_classifier(keyword_tasks: Mapping[str, str]):
+    """Compile task keywords into a single Aho-Corasick automaton"""
+    if not HAS_AHOCORASICK:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword, task in keyword_tasks.items():
+        automaton.add_word(keyword, task)
+    automaton.make_automaton()
+    return automaton
+
 
 class ModelRouter:
     """Route requests to local model only (offline operation)"""
@@ -18,6 +38,27 @@ class ModelRouter:
     TASK_CODING = "coding"
     TASK_ANALYSIS = "analysis"
     
+    # Keyword -> task for classify_task
+    _KEYWORD_TASKS: Dict[str, str] = {
+        **dict.fromkeys((
+            'open', 'close', 'launch', 'start', 'stop', 'kill',
+            'volume', 'brightness', 'screenshot', 'minimize', 'maximize'
+        ), TASK_SYSTEM_COMMAND),
+        **dict.fromkeys((
+            'plan', 'strategy', 'how to', 'steps', 'approach',
+            'design', 'architecture', 'organize'
+        ), TASK_PLANNING),
+        **dict.fromkeys((
+            'code', 'program', 'function', 'class', 'debug',
+            'python', 'javascript', 'write a script'
+        ), TASK_CODING),
+    }
+    
+    # Highest priority first when keywords of several tasks match
+    _TASK_PRIORITY = (TASK_SYSTEM_COMMAND, TASK_PLANNING, TASK_CODING)
+    
+    _CLASSIFIER_DFA = _build_classifier(_KEYWORD_TASKS)
+    
     def __init__(self, registry=None, mode: str = "offline"):
         """
         Initialize router (always offline)
@@ -83,34 +124,7 @@ class ModelRouter:
         Returns:
             Task type constant
         """
-        input_lower = user_input.lower()
-        
-        # System commands
-        system_keywords = [
-            'open', 'close', 'launch', 'start', 'stop', 'kill',
-            'volume', 'brightness', 'screenshot', 'minimize', 'maximize'
-        ]
-        if any(keyword in input_lower for keyword in system_keywords):
-            return self.TASK_SYSTEM_COMMAND
-        
-        # Planning/reasoning
-        planning_keywords = [
-            'plan', 'strategy', 'how to', 'steps', 'approach',
-            'design', 'architecture', 'organize'
-        ]
-        if any(keyword in input_lower for keyword in planning_keywords):
-            return self.TASK_PLANNING
-        
-        # Coding
-        coding_keywords = [
-            'code', 'program', 'function', 'class', 'debug',
-            'python', 'javascript', 'write a script'
-        ]
-        if any(keyword in input_lower for keyword in coding_keywords):
-            return self.TASK_CODING
-        
-        # Default to conversation
-        return self.TASK_CONVERSATION
+        return _classify(user_input.lower())
     
     def generate(self, prompt: str, model_preference: str = 'local', **kwargs) -> str:
         """
@@ -134,6 +148,29 @@ class ModelRouter:
             return f"Error generating response: {str(e)}"
 
 
+@lru_cache(maxsize=256)
+def _classify(input_lower: str) -> str:
+    """Classify lowercased input; cached since users repeat the same phrases"""
+    if ModelRouter._CLASSIFIER_DFA is not None:
+        found = set()
+        for _, task in ModelRouter._CLASSIFIER_DFA.iter(input_lower):
+            if task == ModelRouter.TASK_SYSTEM_COMMAND:
+                return task
+            found.add(task)
+    else:
+        found = {
+            task for keyword, task in ModelRouter._KEYWORD_TASKS.items()
+            if keyword in input_lower
+        }
+    
+    for task in ModelRouter._TASK_PRIORITY:
+        if task in found:
+            return task
+    
+    # Default to conversation
+    return ModelRouter.TASK_CONVERSATION
+
+
 if __name__ == "__main__":
     # Test router
     from .registry import ModelRegistry
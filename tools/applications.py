@@ -4,60 +4,131 @@ Open, close, manage applications, and search Chrome/YouTube
 """
 
 import os
+import shutil
+import struct
 import subprocess
+import sys
 import psutil
 import webbrowser
-import urllib.parse
-from typing import Dict, Any, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from .base import Tool
+from .browser import _get_chrome, _google_search_url, _youtube_search_url
+
+
+# Names that open Windows Settings
+_SETTINGS_ALIASES = frozenset({'settings', 'windows settings', 'system settings'})
+
+# Common Windows applications
+_APP_MAP: Mapping[str, str] = MappingProxyType({
+    'chrome': 'chrome.exe',
+    'firefox': 'firefox.exe',
+    'edge': 'msedge.exe',
+    'notepad': 'notepad.exe',
+    'calculator': 'calc.exe',
+    'explorer': 'explorer.exe',
+    'cmd': 'cmd.exe',
+    'powershell': 'powershell.exe',
+    'vscode': 'code.exe',
+    'spotify': 'spotify.exe'
+})
+
+# Start GUI apps detached from our console so they outlive the assistant;
+# console apps (cmd, powershell) get a console of their own instead, since a
+# detached console process has no window and exits immediately
+if sys.platform == 'win32':
+    _DETACHED_FLAGS = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    _CONSOLE_FLAGS = subprocess.CREATE_NEW_CONSOLE
+else:
+    _DETACHED_FLAGS = 0
+    _CONSOLE_FLAGS = 0
+
+# PE optional header subsystem value for console programs
+_IMAGE_SUBSYSTEM_WINDOWS_CUI = 3
+
+
+@lru_cache(maxsize=64)
+def _which(executable: str):
+    """Resolve an executable on PATH once, or None if not found"""
+    return shutil.which(executable)
+
+
+@lru_cache(maxsize=64)
+def _is_console_app(path: str) -> bool:
+    """Check the PE header of an executable for the console subsystem"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read(2) != b'MZ':
+                return False
+            f.seek(0x3C)
+            pe_offset = struct.unpack('<I', f.read(4))[0]
+            # Subsystem sits 68 bytes into the optional header, after the
+            # 4-byte PE signature and the 20-byte file header
+            f.seek(pe_offset + 4 + 20 + 68)
+            subsystem = struct.unpack('<H', f.read(2))[0]
+    except (OSError, struct.error):
+        return False
+    return subsystem == _IMAGE_SUBSYSTEM_WINDOWS_CUI
+
+
+def _creation_flags(path: str) -> int:
+    """Get the Popen creation flags for starting an executable"""
+    return _CONSOLE_FLAGS if _is_console_app(path) else _DETACHED_FLAGS
 
 
 class ApplicationTool(Tool):
     """Control applications"""
     
+    _PARAMETERS = (
+        MappingProxyType({
+            'name': 'action',
+            'type': 'string',
+            'description': 'Action to perform',
+            'required': True,
+            'enum': ('open', 'close', 'list')
+        }),
+        MappingProxyType({
+            'name': 'app_name',
+            'type': 'string',
+            'description': 'Application name',
+            'required': False
+        }),
+        MappingProxyType({
+            'name': 'detail',
+            'type': 'string',
+            'description': 'How much to report for list: process count, names, or names with PID and memory',
+            'required': False,
+            'enum': ('summary', 'names', 'full')
+        })
+    )
+    
     def __init__(self):
         super().__init__(
             name="application_control",
             description="Open, close, and manage applications"
         )
         self.requires_confirmation = False
+        
+        # Action -> (handler, parameter passed to it)
+        self._actions = {
+            'open': (self._open_app, 'app_name'),
+            'close': (self._close_app, 'app_name'),
+            'list': (self._list_apps, 'detail')
+        }
     
-    def get_parameters(self) -> List[Dict[str, Any]]:
-        return [
-            {
-                'name': 'action',
-                'type': 'string',
-                'description': 'Action to perform',
-                'required': True,
-                'enum': ['open', 'close', 'list']
-            },
-            {
-                'name': 'app_name',
-                'type': 'string',
-                'description': 'Application name',
-                'required': False
-            }
-        ]
-    
-    def execute(self, **params) -> Dict[str, Any]:
+    def _execute_impl(self, **params) -> Dict[str, Any]:
         """Execute application control"""
-        is_valid, error = self.validate_params(**params)
-        if not is_valid:
-            return {'success': False, 'error': error}
-        
         action = params['action']
         
+        handler = self._actions.get(action)
+        if handler is None:
+            return {'success': False, 'error': f'Unknown action: {action}'}
+        
+        method, param_name = handler
         try:
-            if action == 'open':
-                return self._open_app(params.get('app_name'))
-            elif action == 'close':
-                return self._close_app(params.get('app_name'))
-            elif action == 'list':
-                return self._list_apps()
-            else:
-                return {'success': False, 'error': f'Unknown action: {action}'}
-                
-        except Exception as e:
+            return method(params.get(param_name)) if param_name else method()
+        except (OSError, subprocess.SubprocessError, psutil.Error) as e:
             return {'success': False, 'error': str(e)}
     
     def _open_app(self, app_name: str) -> Dict[str, Any]:
@@ -65,43 +136,30 @@ class ApplicationTool(Tool):
         if not app_name:
             return {'success': False, 'error': 'app_name required'}
         
-        # Special handling for Windows Settings
-        if app_name.lower() in ['settings', 'windows settings', 'system settings']:
-            try:
-                subprocess.Popen('start ms-settings:', shell=True)
-                return {
-                    'success': True,
-                    'result': 'Opened Windows Settings',
-                    'message': 'Successfully opened Windows Settings'
-                }
-            except Exception as e:
-                return {'success': False, 'error': f'Failed to open settings: {e}'}
+        app_lower = app_name.lower()
         
-        # Common Windows applications
-        app_map = {
-            'chrome': 'chrome.exe',
-            'firefox': 'firefox.exe',
-            'edge': 'msedge.exe',
-            'notepad': 'notepad.exe',
-            'calculator': 'calc.exe',
-            'explorer': 'explorer.exe',
-            'cmd': 'cmd.exe',
-            'powershell': 'powershell.exe',
-            'vscode': 'code.exe',
-            'spotify': 'spotify.exe'
-        }
+        # Special handling for Windows Settings
+        if app_lower in _SETTINGS_ALIASES:
+            return open_settings()
         
-        app_lower = app_name.lower()
-        executable = app_map.get(app_lower, app_name)
+        executable = _APP_MAP.get(app_lower, app_name)
+        path = _which(executable)
         
         try:
-            subprocess.Popen(executable, shell=True)
+            if path:
+                subprocess.Popen([path], creationflags=_creation_flags(path), close_fds=True)
+            elif sys.platform == 'win32':
+                # Not on PATH; ShellExecute also resolves App Paths registrations,
+                # and no shell ever parses the name
+                os.startfile(executable)
+            else:
+                subprocess.Popen([executable], close_fds=True)
             return {
                 'success': True,
                 'result': f'Opened {app_name}',
                 'message': f'Successfully opened {app_name}'
             }
-        except Exception as e:
+        except OSError as e:
             return {'success': False, 'error': f'Failed to open {app_name}: {e}'}
     
     def _close_app(self, app_name: str) -> Dict[str, Any]:
@@ -109,14 +167,25 @@ class ApplicationTool(Tool):
         if not app_name:
             return {'success': False, 'error': 'app_name required'}
         
+        needle = app_name.lower()
+        
         try:
-            closed = False
-            for proc in psutil.process_iter(['name']):
-                if app_name.lower() in proc.info['name'].lower():
+            targets = [
+                proc for proc in psutil.process_iter(['name'], ad_value=None)
+                if proc.info['name'] and needle in proc.info['name'].lower()
+            ]
+            
+            terminated = []
+            for proc in targets:
+                try:
                     proc.terminate()
-                    closed = True
+                    terminated.append(proc)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
             
-            if closed:
+            if terminated:
+                # Wait for all of them together instead of one by one
+                psutil.wait_procs(terminated, timeout=2)
                 return {
                     'success': True,
                     'result': f'Closed {app_name}',
@@ -125,25 +194,52 @@ class ApplicationTool(Tool):
             else:
                 return {'success': False, 'error': f'{app_name} not running'}
                 
-        except Exception as e:
+        except psutil.Error as e:
             return {'success': False, 'error': f'Failed to close {app_name}: {e}'}
     
-    def _list_apps(self) -> Dict[str, Any]:
-        """List running applications"""
+    def _list_apps(self, detail: Optional[str] = None) -> Dict[str, Any]:
+        """
+        List running applications
+        
+        Args:
+            detail: 'summary' (default) for the process count only, 'names'
+                for process names, 'full' for (name, pid, rss_bytes) tuples
+        """
+        detail = detail or 'summary'
+        
         try:
-            apps = []
-            for proc in psutil.process_iter(['name', 'pid']):
-                apps.append({
-                    'name': proc.info['name'],
-                    'pid': proc.info['pid']
-                })
+            if detail == 'summary':
+                # PIDs only, no per-process name lookups
+                count = len(psutil.pids())
+                return {
+                    'success': True,
+                    'result': count,
+                    'message': f'Found {count} running processes'
+                }
+            
+            if detail == 'names':
+                apps = tuple(
+                    proc.info['name']
+                    for proc in psutil.process_iter(['name'], ad_value=None)
+                )
+            elif detail == 'full':
+                apps = tuple(
+                    (
+                        proc.info['name'],
+                        proc.info['pid'],
+                        proc.info['memory_info'].rss if proc.info['memory_info'] else None
+                    )
+                    for proc in psutil.process_iter(['name', 'pid', 'memory_info'], ad_value=None)
+                )
+            else:
+                return {'success': False, 'error': f'Unknown detail level: {detail}'}
             
             return {
                 'success': True,
                 'result': apps,
                 'message': f'Found {len(apps)} running processes'
             }
-        except Exception as e:
+        except psutil.Error as e:
             return {'success': False, 'error': str(e)}
 
 
@@ -151,46 +247,47 @@ class ApplicationTool(Tool):
 def search_chrome(query: str) -> Dict[str, Any]:
     """Search on Google Chrome"""
     try:
-        search_url = f"https://www.google.com/search?q={urllib.parse.quote(query)}"
-        # Try Chrome first
-        try:
-            webbrowser.get('chrome').open(search_url)
-        except:
-            # Fallback to default browser
-            webbrowser.open(search_url)
+        search_url = _google_search_url(query)
+        # Try Chrome first, fall back to the default browser
+        controller = _get_chrome() or webbrowser
+        controller.open(search_url)
         return {
             'success': True,
             'result': f'Searching for: {query}',
             'message': f'Opened browser with search: {query}'
         }
-    except Exception as e:
+    except (OSError, webbrowser.Error) as e:
         return {'success': False, 'error': f'Failed to open browser: {e}'}
 
 
 def search_youtube(query: str) -> Dict[str, Any]:
     """Search on YouTube"""
     try:
-        search_url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(query)}"
+        search_url = _youtube_search_url(query)
         webbrowser.open(search_url)
         return {
             'success': True,
             'result': f'Searching YouTube for: {query}',
             'message': f'Opened YouTube with search: {query}'
         }
-    except Exception as e:
+    except (OSError, webbrowser.Error) as e:
         return {'success': False, 'error': f'Failed to open YouTube: {e}'}
 
 
 def open_settings() -> Dict[str, Any]:
     """Open Windows Settings"""
     try:
-        subprocess.Popen('start ms-settings:', shell=True)
+        if sys.platform == 'win32':
+            # ShellExecute directly, no cmd.exe
+            os.startfile('ms-settings:')
+        else:
+            subprocess.Popen('start ms-settings:', shell=True)
         return {
             'success': True,
             'result': 'Opened Windows Settings',
             'message': 'Successfully opened Windows Settings'
         }
-    except Exception as e:
+    except OSError as e:
         return {'success': False, 'error': f'Failed to open settings: {e}'}
 
 
@@ -200,11 +297,15 @@ def open_website(url: str) -> Dict[str, Any]:
         # Add https:// if not present
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
-        webbrowser.open(url)
+        if sys.platform == 'win32':
+            # Default protocol handler via ShellExecute
+            os.startfile(url)
+        else:
+            webbrowser.open(url)
         return {
             'success': True,
             'result': f'Opened {url}',
             'message': f'Successfully opened {url}'
         }
-    except Exception as e:
+    except (OSError, webbrowser.Error) as e:
         return {'success': False, 'error': f'Failed to open website: {e}'}
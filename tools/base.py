@@ -3,13 +3,28 @@ Base Tool Interface
 Abstract base class for all tools
 """
 
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, Mapping, Tuple
 
 
 class Tool(ABC):
     """Abstract base class for tools"""
     
+    # Parameter schema, defined once per subclass
+    _PARAMETERS: Tuple[Mapping[str, Any], ...] = ()
+    
+    # Names of required parameters in schema order, filled in per subclass
+    _required_params: Tuple[str, ...] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        """Precompute the required parameter names from the subclass schema"""
+        super().__init_subclass__(**kwargs)
+        cls._required_params = tuple(
+            p['name'] for p in cls._PARAMETERS
+            if p.get('required', False)
+        )
+    
     def __init__(self, name: str, description: str):
         """
         Initialize tool
@@ -23,10 +38,9 @@ class Tool(ABC):
         self.requires_confirmation = False
         self.is_dangerous = False
     
-    @abstractmethod
     def execute(self, **params) -> Dict[str, Any]:
         """
-        Execute the tool
+        Validate parameters and execute the tool
         
         Args:
             **params: Tool parameters
@@ -38,18 +52,39 @@ class Tool(ABC):
                 - message: str
                 - error: Optional[str]
         """
-        pass
+        is_valid, error = self.validate_params(**params)
+        if not is_valid:
+            return {'success': False, 'error': error}
+        
+        # Interned so the action table lookup can match by identity
+        action = params.get('action')
+        if type(action) is str:
+            params['action'] = sys.intern(action)
+        
+        return self._execute_impl(**params)
     
     @abstractmethod
-    def get_parameters(self) -> List[Dict[str, Any]]:
+    def _execute_impl(self, **params) -> Dict[str, Any]:
         """
-        Get tool parameter schema
+        Execute the tool with already validated parameters
+        
+        Args:
+            **params: Tool parameters
         
         Returns:
-            List of parameter definitions
+            Same as execute()
         """
         pass
     
+    def get_parameters(self) -> Tuple[Mapping[str, Any], ...]:
+        """
+        Get tool parameter schema
+        
+        Returns:
+            Read-only parameter definitions (the class's _PARAMETERS)
+        """
+        return self._PARAMETERS
+    
     def validate_params(self, **params) -> tuple[bool, str]:
         """
         Validate parameters
@@ -60,21 +95,19 @@ class Tool(ABC):
         Returns:
             (is_valid, error_message)
         """
-        param_schema = {p['name']: p for p in self.get_parameters()}
-        
         # Check required parameters
-        for param_name, param_def in param_schema.items():
-            if param_def.get('required', False) and param_name not in params:
+        for param_name in self._required_params:
+            if param_name not in params:
                 return False, f"Missing required parameter: {param_name}"
         
         return True, ""
     
     def get_info(self) -> Dict[str, Any]:
-        """Get tool information"""
+        """Get tool information (plain dicts, ready for json.dumps)"""
         return {
             'name': self.name,
             'description': self.description,
-            'parameters': self.get_parameters(),
+            'parameters': [dict(p) for p in self.get_parameters()],
             'requires_confirmation': self.requires_confirmation,
             'is_dangerous': self.is_dangerous
         }
@@ -3,64 +3,118 @@ Browser Control Tool
 Open URLs, search engines, manage browser operations
 """
 
+import os
+import shutil
+import subprocess
+import sys
 import webbrowser
 import urllib.parse
-from typing import Dict, Any, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any
 from .base import Tool
 
 
+# Hand URLs to the OS default handler, chosen once per platform
+if sys.platform == 'win32':
+    _OPEN = os.startfile
+elif sys.platform == 'darwin':
+    def _OPEN(url: str):
+        subprocess.Popen(['open', url])
+elif shutil.which('xdg-open'):
+    def _OPEN(url: str):
+        subprocess.Popen(['xdg-open', url])
+else:
+    _OPEN = webbrowser.open
+
+_GOOGLE_PREFIX = "https://www.google.com/search?q="
+_YOUTUBE_PREFIX = "https://www.youtube.com/results?search_query="
+
+
+@lru_cache(maxsize=256)
+def _quote_query(query: str) -> str:
+    """URL-encode a search query (cached, searches repeat often)"""
+    return urllib.parse.quote(query)
+
+
+def _google_search_url(query: str) -> str:
+    """Build the Google search URL for a query"""
+    return _GOOGLE_PREFIX + _quote_query(query)
+
+
+def _youtube_search_url(query: str) -> str:
+    """Build the YouTube search URL for a query"""
+    return _YOUTUBE_PREFIX + _quote_query(query)
+
+
+# Chrome controller, looked up once on first search
+_CHROME = None
+_CHROME_TRIED = False
+
+
+def _get_chrome():
+    """Get the cached Chrome controller, or None if Chrome is not registered"""
+    global _CHROME, _CHROME_TRIED
+    if not _CHROME_TRIED:
+        try:
+            _CHROME = webbrowser.get('chrome')
+        except webbrowser.Error:
+            _CHROME = None
+        _CHROME_TRIED = True
+    return _CHROME
+
+
 class BrowserTool(Tool):
     """Control browser operations"""
     
+    _PARAMETERS = (
+        MappingProxyType({
+            'name': 'action',
+            'type': 'string',
+            'description': 'Action to perform',
+            'required': True,
+            'enum': ('open', 'search', 'youtube')
+        }),
+        MappingProxyType({
+            'name': 'url',
+            'type': 'string',
+            'description': 'URL to open',
+            'required': False
+        }),
+        MappingProxyType({
+            'name': 'query',
+            'type': 'string',
+            'description': 'Search query',
+            'required': False
+        })
+    )
+    
     def __init__(self):
         super().__init__(
             name="browser_control",
             description="Open URLs, search Google, search YouTube"
         )
         self.requires_confirmation = False
+        
+        # Action -> (handler, parameter passed to it)
+        self._actions = {
+            'open': (self._open_url, 'url'),
+            'search': (self._search_google, 'query'),
+            'youtube': (self._search_youtube, 'query')
+        }
     
-    def get_parameters(self) -> List[Dict[str, Any]]:
-        return [
-            {
-                'name': 'action',
-                'type': 'string',
-                'description': 'Action to perform',
-                'required': True,
-                'enum': ['open', 'search', 'youtube']
-            },
-            {
-                'name': 'url',
-                'type': 'string',
-                'description': 'URL to open',
-                'required': False
-            },
-            {
-                'name': 'query',
-                'type': 'string',
-                'description': 'Search query',
-                'required': False
-            }
-        ]
-    
-    def execute(self, **params) -> Dict[str, Any]:
+    def _execute_impl(self, **params) -> Dict[str, Any]:
         """Execute browser control"""
-        is_valid, error = self.validate_params(**params)
-        if not is_valid:
-            return {'success': False, 'error': error}
-        
         action = params['action']
         
+        handler = self._actions.get(action)
+        if handler is None:
+            return {'success': False, 'error': f'Unknown action: {action}'}
+        
+        method, param_name = handler
         try:
-            if action == 'open':
-                return self._open_url(params.get('url'))
-            elif action == 'search':
-                return self._search_google(params.get('query'))
-            elif action == 'youtube':
-                return self._search_youtube(params.get('query'))
-            else:
-                return {'success': False, 'error': f'Unknown action: {action}'}
-                
-        except Exception as e:
+            return method(params.get(param_name)) if param_name else method()
+        except (OSError, webbrowser.Error) as e:
             return {'success': False, 'error': str(e)}
     
     def _open_url(self, url: str) -> Dict[str, Any]:
@@ -73,13 +127,13 @@ class BrowserTool(Tool):
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
             
-            webbrowser.open(url)
+            _OPEN(url)
             return {
                 'success': True,
                 'result': f'Opened {url}',
                 'message': f'Successfully opened {url}'
             }
-        except Exception as e:
+        except (OSError, webbrowser.Error) as e:
             return {'success': False, 'error': f'Failed to open URL: {e}'}
     
     def _search_google(self, query: str) -> Dict[str, Any]:
@@ -88,20 +142,21 @@ class BrowserTool(Tool):
             return {'success': False, 'error': 'Query required'}
         
         try:
-            search_url = f"https://www.google.com/search?q={urllib.parse.quote(query)}"
+            search_url = _google_search_url(query)
             
             # Try Chrome first, fallback to default browser
-            try:
-                webbrowser.get('chrome').open(search_url)
-            except:
-                webbrowser.open(search_url)
+            chrome = _get_chrome()
+            if chrome is not None:
+                chrome.open(search_url)
+            else:
+                _OPEN(search_url)
             
             return {
                 'success': True,
                 'result': f'Searching for: {query}',
                 'message': f'Opened browser with Google search: {query}'
             }
-        except Exception as e:
+        except (OSError, webbrowser.Error) as e:
             return {'success': False, 'error': f'Failed to search: {e}'}
     
     def _search_youtube(self, query: str) -> Dict[str, Any]:
@@ -110,35 +165,44 @@ class BrowserTool(Tool):
             return {'success': False, 'error': 'Query required'}
         
         try:
-            search_url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(query)}"
-            webbrowser.open(search_url)
+            search_url = _youtube_search_url(query)
+            _OPEN(search_url)
             
             return {
                 'success': True,
                 'result': f'Searching YouTube for: {query}',
                 'message': f'Opened YouTube with search: {query}'
             }
-        except Exception as e:
+        except (OSError, webbrowser.Error) as e:
             return {'success': False, 'error': f'Failed to search YouTube: {e}'}
 
 
+# Shared tool instance for the utility functions
+_BROWSER_TOOL = None
+
+
+def _get_tool() -> BrowserTool:
+    """Get the shared BrowserTool, creating it on first use"""
+    global _BROWSER_TOOL
+    if _BROWSER_TOOL is None:
+        _BROWSER_TOOL = BrowserTool()
+    return _BROWSER_TOOL
+
+
 # Utility functions
 def search_google(query: str) -> Dict[str, Any]:
     """Search on Google Chrome"""
-    tool = BrowserTool()
-    return tool.execute(action='search', query=query)
+    return _get_tool().execute(action='search', query=query)
 
 
 def search_youtube(query: str) -> Dict[str, Any]:
     """Search on YouTube"""
-    tool = BrowserTool()
-    return tool.execute(action='youtube', query=query)
+    return _get_tool().execute(action='youtube', query=query)
 
 
 def open_url(url: str) -> Dict[str, Any]:
     """Open a specific website"""
-    tool = BrowserTool()
-    return tool.execute(action='open', url=url)
+    return _get_tool().execute(action='open', url=url)
 
 
 if __name__ == "__main__":
@@ -3,7 +3,9 @@ Tool Executor
 Manages and executes tools with validation
 """
 
-from typing import Dict, Any, Optional, List
+import sys
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping, Tuple
 from .base import Tool
 from .applications import ApplicationTool
 from .files import FileTool
@@ -11,9 +13,41 @@ from .system import SystemTool
 from .browser import BrowserTool
 
 
+# Default tool instances, shared by every ToolExecutor
+_DEFAULT_TOOLS: Optional[Tuple[Tool, ...]] = None
+
+
+def _default_tools() -> Tuple[Tool, ...]:
+    """Get the shared default tools, creating them on first use"""
+    global _DEFAULT_TOOLS
+    if _DEFAULT_TOOLS is None:
+        _DEFAULT_TOOLS = (ApplicationTool(), FileTool(), SystemTool(), BrowserTool())
+    return _DEFAULT_TOOLS
+
+
+def get_shared_tool(name: str) -> Optional[Tool]:
+    """Get the shared default tool registered under name"""
+    for tool in _default_tools():
+        if tool.name == name:
+            return tool
+    return None
+
+
 class ToolExecutor:
     """Execute tools with validation and safety checks"""
     
+    # Intent action -> (tool name, tool action, parameter that receives the target)
+    _TOOL_MAPPING: Mapping[str, Tuple[str, str, Optional[str]]] = MappingProxyType({
+        'open_application': ('application_control', 'open', 'app_name'),
+        'close_application': ('application_control', 'close', 'app_name'),
+        'search_file': ('file_operations', 'search', 'query'),
+        'open_file': ('file_operations', 'open', 'path'),
+        'open_url': ('browser_control', 'open', 'url'),
+        'search_web': ('browser_control', 'search', 'query'),
+        'take_screenshot': ('system_control', 'screenshot', None),
+        'control_volume': ('system_control', 'volume', 'value'),
+    })
+    
     def __init__(self):
         """Initialize tool executor"""
         self.tools: Dict[str, Tool] = {}
@@ -21,10 +55,8 @@ class ToolExecutor:
     
     def _register_default_tools(self):
         """Register default tools"""
-        self.register_tool(ApplicationTool())
-        self.register_tool(FileTool())
-        self.register_tool(SystemTool())
-        self.register_tool(BrowserTool())
+        for tool in _default_tools():
+            self.register_tool(tool)
     
     def register_tool(self, tool: Tool):
         """Register a tool"""
@@ -73,15 +105,7 @@ class ToolExecutor:
                 'tool_info': tool.get_info()
             }
         
-        # Validate parameters
-        is_valid, error = tool.validate_params(**params)
-        if not is_valid:
-            return {
-                'success': False,
-                'error': f'Invalid parameters: {error}'
-            }
-        
-        # Execute tool
+        # Execute tool (validates its own parameters)
         try:
             result = tool.execute(**params)
             return result
@@ -102,30 +126,26 @@ class ToolExecutor:
             Execution result
         """
         action = intent.get('action')
+        if type(action) is str:
+            # Interned so the mapping lookup can match by identity
+            action = sys.intern(action)
         target = intent.get('target')
         params = intent.get('parameters', {})
         
         # Map action to tool
-        tool_mapping = {
-            'open_application': ('application_control', {'action': 'open', 'app_name': target}),
-            'close_application': ('application_control', {'action': 'close', 'app_name': target}),
-            'search_file': ('file_operations', {'action': 'search', 'query': target}),
-            'open_file': ('file_operations', {'action': 'open', 'path': target}),
-            'open_url': ('browser_control', {'action': 'open', 'url': target}),
-            'search_web': ('browser_control', {'action': 'search', 'query': target}),
-            'take_screenshot': ('system_control', {'action': 'screenshot'}),
-            'control_volume': ('system_control', {'action': 'volume', 'value': target}),
-        }
-        
-        if action in tool_mapping:
-            tool_name, tool_params = tool_mapping[action]
-            tool_params.update(params)
-            return self.execute(tool_name, tool_params)
-        else:
+        entry = self._TOOL_MAPPING.get(action)
+        if entry is None:
             return {
                 'success': False,
                 'error': f'Unknown action: {action}'
             }
+        
+        tool_name, tool_action, target_key = entry
+        tool_params = {'action': tool_action}
+        if target_key is not None:
+            tool_params[target_key] = target
+        tool_params.update(params)
+        return self.execute(tool_name, tool_params)
 
 
 if __name__ == "__main__":
@@ -3,16 +3,155 @@ File Operations Tool
 Search, open, and manage files
 """
 
+import fnmatch
 import os
+import re
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Iterator, List, Optional
 from .base import Tool
 
+SEARCH_LIMIT = 10
+
+_WINDOWS_SEARCH_DSN = "Provider=Search.CollatorDSO;Extended Properties='Application=Windows';"
+
+# Walks the search folders concurrently (one worker per folder)
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=3, thread_name_prefix="file-search")
+
+
+# Windows Search index queries (optional, part of pywin32); imported on the
+# first search since it loads COM
+@lru_cache(maxsize=1)
+def _adodbapi():
+    """Import adodbapi, or None if it is not installed"""
+    try:
+        import adodbapi
+    except ImportError:
+        return None
+    return adodbapi
+
+
+def _sql_quote(text: str) -> str:
+    """Escape text for a single-quoted Windows Search SQL string"""
+    return text.replace("'", "''")
+
+
+def _like_escape(text: str) -> str:
+    """Escape text for a quoted Windows Search SQL LIKE pattern"""
+    return _sql_quote(text.replace('[', '[[]').replace('%', '[%]').replace('_', '[_]'))
+
+
+@lru_cache(maxsize=64)
+def _compile_glob(query: str) -> Callable[[str], Any]:
+    """
+    Compile the *query* file name glob once per query
+    
+    Returns:
+        Match function for names passed through os.path.normcase (so the
+        match is case-insensitive on Windows only)
+    """
+    return re.compile(fnmatch.translate(os.path.normcase(f"*{query}*"))).match
+
+
+def _iter_matches(
+    root: str,
+    match: Callable[[str], Any],
+    stop: Optional[threading.Event] = None
+) -> Iterator[str]:
+    """
+    Walk root depth-first, yielding paths of files whose name matches
+    
+    Args:
+        root: Folder to walk
+        match: Name matcher from _compile_glob
+        stop: Ends the walk early once set
+    """
+    stack = [root]
+    while stack and not (stop and stop.is_set()):
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif (entry.is_file(follow_symlinks=False)
+                          and match(os.path.normcase(entry.name))):
+                        yield entry.path
+        except OSError:
+            # Unreadable or vanished folder
+            continue
+
+
+def _collect_matches(root: str, match: Callable[[str], Any], stop: threading.Event) -> List[str]:
+    """Collect up to SEARCH_LIMIT matches under root"""
+    return list(islice(_iter_matches(root, match, stop), SEARCH_LIMIT))
+
+
+def _search_windows_index(query: str, search_dirs: List[Path]) -> Optional[List[str]]:
+    """
+    Look up file names in the Windows Search index
+    
+    Args:
+        query: Text the file name must contain
+        search_dirs: Folders to search in
+    
+    Returns:
+        Matching file paths, or None if the index is unavailable
+    """
+    adodbapi = _adodbapi()
+    if adodbapi is None:
+        return None
+    
+    scopes = " OR ".join(
+        f"SCOPE='file:{_sql_quote(d.as_posix())}'" for d in search_dirs
+    )
+    sql = (
+        f"SELECT TOP {SEARCH_LIMIT} System.ItemPathDisplay FROM SystemIndex "
+        f"WHERE ({scopes}) AND System.FileName LIKE '%{_like_escape(query)}%' "
+        f"AND System.ItemType <> 'Directory'"
+    )
+    
+    try:
+        conn = adodbapi.connect(_WINDOWS_SEARCH_DSN)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql)
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+    except adodbapi.Error:
+        return None
+
 
 class FileTool(Tool):
     """File operations"""
     
+    _PARAMETERS = (
+        MappingProxyType({
+            'name': 'action',
+            'type': 'string',
+            'description': 'Action to perform',
+            'required': True,
+            'enum': ('search', 'open', 'create', 'delete')
+        }),
+        MappingProxyType({
+            'name': 'path',
+            'type': 'string',
+            'description': 'File or folder path',
+            'required': False
+        }),
+        MappingProxyType({
+            'name': 'query',
+            'type': 'string',
+            'description': 'Search query',
+            'required': False
+        })
+    )
+    
     def __init__(self):
         super().__init__(
             name="file_operations",
@@ -20,51 +159,27 @@ class FileTool(Tool):
         )
         self.requires_confirmation = True
         self.is_dangerous = True
+        
+        # Action -> (handler, parameter passed to it)
+        self._actions = {
+            'search': (self._search_files, 'query'),
+            'open': (self._open_file, 'path'),
+            'create': (self._create_file, 'path'),
+            'delete': (self._delete_file, 'path')
+        }
     
-    def get_parameters(self) -> List[Dict[str, Any]]:
-        return [
-            {
-                'name': 'action',
-                'type': 'string',
-                'description': 'Action to perform',
-                'required': True,
-                'enum': ['search', 'open', 'create', 'delete']
-            },
-            {
-                'name': 'path',
-                'type': 'string',
-                'description': 'File or folder path',
-                'required': False
-            },
-            {
-                'name': 'query',
-                'type': 'string',
-                'description': 'Search query',
-                'required': False
-            }
-        ]
-    
-    def execute(self, **params) -> Dict[str, Any]:
+    def _execute_impl(self, **params) -> Dict[str, Any]:
         """Execute file operation"""
-        is_valid, error = self.validate_params(**params)
-        if not is_valid:
-            return {'success': False, 'error': error}
-        
         action = params['action']
         
+        handler = self._actions.get(action)
+        if handler is None:
+            return {'success': False, 'error': f'Unknown action: {action}'}
+        
+        method, param_name = handler
         try:
-            if action == 'search':
-                return self._search_files(params.get('query'))
-            elif action == 'open':
-                return self._open_file(params.get('path'))
-            elif action == 'create':
-                return self._create_file(params.get('path'))
-            elif action == 'delete':
-                return self._delete_file(params.get('path'))
-            else:
-                return {'success': False, 'error': f'Unknown action: {action}'}
-                
-        except Exception as e:
+            return method(params.get(param_name)) if param_name else method()
+        except (OSError, subprocess.SubprocessError) as e:
             return {'success': False, 'error': str(e)}
     
     def _search_files(self, query: str) -> Dict[str, Any]:
@@ -80,21 +195,33 @@ class FileTool(Tool):
                 Path.home() / "Downloads"
             ]
             
-            results = []
-            for search_dir in search_dirs:
-                if search_dir.exists():
-                    for file in search_dir.rglob(f"*{query}*"):
-                        if file.is_file():
-                            results.append(str(file))
-                        if len(results) >= 10:  # Limit results
+            results = _search_windows_index(query, search_dirs)
+            if results is None:
+                # No index, walk the folders (stopping at the limit)
+                match = _compile_glob(query)
+                stop = threading.Event()
+                futures = [
+                    _SEARCH_POOL.submit(_collect_matches, str(search_dir), match, stop)
+                    for search_dir in search_dirs
+                ]
+                
+                results = []
+                try:
+                    for future in as_completed(futures):
+                        results.extend(future.result())
+                        if len(results) >= SEARCH_LIMIT:
                             break
+                finally:
+                    # Stop walks still running once we have enough (or failed)
+                    stop.set()
+                results = results[:SEARCH_LIMIT]
             
             return {
                 'success': True,
                 'result': results,
                 'message': f'Found {len(results)} files matching "{query}"'
             }
-        except Exception as e:
+        except OSError as e:
             return {'success': False, 'error': str(e)}
     
     def _open_file(self, path: str) -> Dict[str, Any]:
@@ -103,16 +230,15 @@ class FileTool(Tool):
             return {'success': False, 'error': 'path required'}
         
         try:
-            if os.path.exists(path):
-                os.startfile(path)
-                return {
-                    'success': True,
-                    'result': f'Opened {path}',
-                    'message': f'Successfully opened {path}'
-                }
-            else:
-                return {'success': False, 'error': f'File not found: {path}'}
-        except Exception as e:
+            os.startfile(path)
+            return {
+                'success': True,
+                'result': f'Opened {path}',
+                'message': f'Successfully opened {path}'
+            }
+        except FileNotFoundError:
+            return {'success': False, 'error': f'File not found: {path}'}
+        except OSError as e:
             return {'success': False, 'error': str(e)}
     
     def _create_file(self, path: str) -> Dict[str, Any]:
@@ -127,7 +253,7 @@ class FileTool(Tool):
                 'result': f'Created {path}',
                 'message': f'Successfully created {path}'
             }
-        except Exception as e:
+        except OSError as e:
             return {'success': False, 'error': str(e)}
     
     def _delete_file(self, path: str) -> Dict[str, Any]:
@@ -136,14 +262,13 @@ class FileTool(Tool):
             return {'success': False, 'error': 'path required'}
         
         try:
-            if os.path.exists(path):
-                os.remove(path)
-                return {
-                    'success': True,
-                    'result': f'Deleted {path}',
-                    'message': f'Successfully deleted {path}'
-                }
-            else:
-                return {'success': False, 'error': f'File not found: {path}'}
-        except Exception as e:
+            os.remove(path)
+            return {
+                'success': True,
+                'result': f'Deleted {path}',
+                'message': f'Successfully deleted {path}'
+            }
+        except FileNotFoundError:
+            return {'success': False, 'error': f'File not found: {path}'}
+        except OSError as e:
             return {'success': False, 'error': str(e)}
@@ -3,121 +3,389 @@ System Control Tool
 Control volume, brightness, screenshots, clipboard
 """
 
+import importlib
 import subprocess
-from typing import Dict, Any, List
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, Optional
 from .base import Tool
 
 
+# Heavy optional dependencies, imported on first use and then reused
+@lru_cache(maxsize=1)
+def _pyautogui():
+    """Import pyautogui (pulls in Pillow and tkinter)"""
+    import pyautogui
+    return pyautogui
+
+
+# mss screen grabbers hold a device context bound to the creating thread
+_SCREEN_GRABBERS = threading.local()
+
+# Commands run on a fresh worker thread each time, so screenshots are taken on
+# this one long-lived thread and its grabber is created once and reused
+_SCREENSHOT_THREAD = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+
+
+def _mss():
+    """Get this thread's mss screen grabber, or None if mss is not installed"""
+    sct = getattr(_SCREEN_GRABBERS, 'sct', None)
+    if sct is None:
+        try:
+            import mss
+        except ImportError:
+            return None
+        sct = _SCREEN_GRABBERS.sct = mss.mss()
+    return sct
+
+
+@lru_cache(maxsize=1)
+def _pyperclip():
+    """Import pyperclip"""
+    import pyperclip
+    return pyperclip
+
+
+_COINIT_MULTITHREADED = 0x0
+
+
+def _com_thread_init():
+    """
+    Join the volume thread to the multithreaded COM apartment
+    
+    Must not raise: a failing initializer leaves the executor unusable.
+    """
+    if sys.platform != 'win32':
+        return
+    
+    import ctypes
+    try:
+        ctypes.oledll.ole32.CoInitializeEx(None, _COINIT_MULTITHREADED)
+    except OSError:
+        # Cannot happen on a fresh thread; volume calls then report COM errors
+        return
+    
+    # Importing comtypes initializes the importing thread with
+    # sys.coinit_flags (STA by default); if this is the first import, match
+    # the apartment chosen above so the import does not fail with
+    # RPC_E_CHANGED_MODE
+    if 'comtypes' in sys.modules:
+        return
+    had_flags = hasattr(sys, 'coinit_flags')
+    previous = getattr(sys, 'coinit_flags', None)
+    sys.coinit_flags = _COINIT_MULTITHREADED
+    try:
+        importlib.import_module('comtypes')
+    except ImportError:
+        # No comtypes; volume calls then fail on their own
+        pass
+    finally:
+        if had_flags:
+            sys.coinit_flags = previous
+        else:
+            del sys.coinit_flags
+
+
+# COM interface pointers belong to the apartment of the thread that created
+# them, and commands run on a fresh worker thread each time; the volume
+# endpoint is therefore activated, cached and used only on this one thread
+_VOLUME_THREAD = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="volume", initializer=_com_thread_init
+)
+
+
+def _activate_speakers():
+    """Activate the default speakers' IAudioEndpointVolume interface (Windows)"""
+    from ctypes import cast, POINTER
+    from comtypes import CLSCTX_ALL
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+    
+    devices = AudioUtilities.GetSpeakers()
+    interface = devices.Activate(
+        IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+    return cast(interface, POINTER(IAudioEndpointVolume))
+
+
+@lru_cache(maxsize=1)
+def _default_device_watcher_class():
+    """Build an IMMNotificationClient that reports default device changes"""
+    from pycaw.callbacks import MMNotificationClient
+    
+    class DefaultDeviceWatcher(MMNotificationClient):
+        def __init__(self, on_change):
+            super().__init__()
+            self._on_change = on_change
+        
+        def on_default_device_changed(self, flow, flow_id, role, role_id, default_device_id):
+            self._on_change()
+    
+    return DefaultDeviceWatcher
+
+
+@lru_cache(maxsize=1)
+def _volume_watcher_class():
+    """Build an IAudioEndpointVolumeCallback that reports volume changes"""
+    from pycaw.callbacks import AudioEndpointVolumeCallback
+    
+    class VolumeWatcher(AudioEndpointVolumeCallback):
+        def __init__(self, on_change):
+            super().__init__()
+            self._on_change = on_change
+        
+        def on_notify(self, new_volume, new_mute, event_context, channels, channel_volumes):
+            self._on_change(self, new_volume)
+    
+    return VolumeWatcher
+
+
 class SystemTool(Tool):
     """System control operations"""
     
+    _PARAMETERS = (
+        MappingProxyType({
+            'name': 'action',
+            'type': 'string',
+            'description': 'Action to perform',
+            'required': True,
+            'enum': ('volume', 'screenshot', 'clipboard')
+        }),
+        MappingProxyType({
+            'name': 'value',
+            'type': 'string',
+            'description': 'Value for action (e.g., volume level, clipboard text)',
+            'required': False
+        })
+    )
+    
     def __init__(self):
         super().__init__(
             name="system_control",
             description="Control system settings and take screenshots"
         )
         self.requires_confirmation = False
+        
+        # Speaker volume interface, activated on first use
+        self._volume_endpoint = None
+        self._device_enumerator = None
+        self._device_watcher = None
+        
+        # Last known master volume level, only trusted while a change callback
+        # on the current endpoint keeps it up to date
+        self._cached_level: Optional[float] = None
+        self._volume_watcher = None
+        
+        # Set from the device notification thread; the volume thread then
+        # releases the endpoint before its next use
+        self._endpoint_stale = False
+        
+        # Guards the volume state shared with the COM notification threads
+        self._volume_lock = threading.Lock()
+        
+        # Screenshots go to the Pictures folder, created on first use
+        self._screenshots_dir = Path.home() / "Pictures" / "Smart Assistant Screenshots"
+        self._screenshots_dir_ready = False
+        self._ts_format = "%Y%m%d_%H%M%S"
+        
+        # Action -> (handler, parameter passed to it)
+        self._actions = {
+            'volume': (self._control_volume, 'value'),
+            'screenshot': (self._take_screenshot, None),
+            'clipboard': (self._get_clipboard, None)
+        }
     
-    def get_parameters(self) -> List[Dict[str, Any]]:
-        return [
-            {
-                'name': 'action',
-                'type': 'string',
-                'description': 'Action to perform',
-                'required': True,
-                'enum': ['volume', 'screenshot', 'clipboard']
-            },
-            {
-                'name': 'value',
-                'type': 'string',
-                'description': 'Value for action (e.g., volume level, clipboard text)',
-                'required': False
-            }
-        ]
-    
-    def execute(self, **params) -> Dict[str, Any]:
+    def _execute_impl(self, **params) -> Dict[str, Any]:
         """Execute system control"""
-        is_valid, error = self.validate_params(**params)
-        if not is_valid:
-            return {'success': False, 'error': error}
-        
         action = params['action']
         
+        handler = self._actions.get(action)
+        if handler is None:
+            return {'success': False, 'error': f'Unknown action: {action}'}
+        
+        method, param_name = handler
         try:
-            if action == 'volume':
-                return self._control_volume(params.get('value'))
-            elif action == 'screenshot':
-                return self._take_screenshot()
-            elif action == 'clipboard':
-                return self._get_clipboard()
-            else:
-                return {'success': False, 'error': f'Unknown action: {action}'}
-                
-        except Exception as e:
+            return method(params.get(param_name)) if param_name else method()
+        except (OSError, subprocess.SubprocessError) as e:
             return {'success': False, 'error': str(e)}
     
-    def _control_volume(self, value: str) -> Dict[str, Any]:
-        """Control system volume"""
+    def _get_volume_endpoint(self):
+        """Get the cached speaker volume interface, activating it if needed"""
+        with self._volume_lock:
+            stale = self._endpoint_stale
+            self._endpoint_stale = False
+        if stale:
+            self._release_volume_endpoint()
+        
+        if self._volume_endpoint is None:
+            volume = _activate_speakers()
+            with self._volume_lock:
+                self._volume_endpoint = volume
+            self._watch_volume(volume)
+            if self._device_watcher is None:
+                self._watch_default_device()
+        return self._volume_endpoint
+    
+    def _release_volume_endpoint(self):
+        """Unregister the volume callback and drop the cached interface"""
+        with self._volume_lock:
+            volume, watcher = self._volume_endpoint, self._volume_watcher
+            self._volume_endpoint = None
+            self._volume_watcher = None
+            self._cached_level = None
+        
+        if volume is not None and watcher is not None:
+            try:
+                volume.UnregisterControlChangeNotify(watcher)
+            except Exception:
+                # Device already gone; it no longer sends notifications
+                pass
+    
+    def _invalidate_volume_endpoint(self):
+        """Mark the cached volume interface stale (the output device changed)"""
+        with self._volume_lock:
+            self._endpoint_stale = True
+            self._cached_level = None
+    
+    def _watch_volume(self, volume):
+        """Track the endpoint's volume level through change notifications"""
         try:
-            from ctypes import cast, POINTER
-            from comtypes import CLSCTX_ALL
-            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+            watcher = _volume_watcher_class()(self._on_volume_changed)
+            volume.RegisterControlChangeNotify(watcher)
+        except Exception:
+            # No callbacks available; always read the level from the device
+            return
+        
+        with self._volume_lock:
+            self._volume_watcher = watcher
+    
+    def _on_volume_changed(self, watcher, new_level: float):
+        """Volume change callback (from us or any other app)"""
+        with self._volume_lock:
+            # Ignore notifications still in flight from a released endpoint
+            if watcher is self._volume_watcher:
+                self._cached_level = new_level
+    
+    def _get_level(self, volume) -> float:
+        """Get the master volume level, from the cache when it is kept in sync"""
+        with self._volume_lock:
+            if self._volume_watcher is not None and self._cached_level is not None:
+                return self._cached_level
+        
+        level = volume.GetMasterVolumeLevelScalar()
+        with self._volume_lock:
+            if self._volume_watcher is not None:
+                self._cached_level = level
+        return level
+    
+    def _set_level(self, volume, level: float):
+        """Set the master volume level and remember it"""
+        volume.SetMasterVolumeLevelScalar(level, None)
+        with self._volume_lock:
+            if self._volume_watcher is not None:
+                self._cached_level = level
+    
+    def _forget_level(self):
+        """Stop trusting the cached level (e.g. after a mute change)"""
+        with self._volume_lock:
+            self._cached_level = None
+    
+    def _watch_default_device(self):
+        """Invalidate the volume interface whenever the default device changes"""
+        try:
+            from pycaw.pycaw import AudioUtilities
             
-            devices = AudioUtilities.GetSpeakers()
-            interface = devices.Activate(
-                IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-            volume = cast(interface, POINTER(IAudioEndpointVolume))
+            watcher = _default_device_watcher_class()(self._invalidate_volume_endpoint)
+            enumerator = AudioUtilities.GetDeviceEnumerator()
+            enumerator.RegisterEndpointNotificationCallback(watcher)
+        except Exception:
+            # Older pycaw or no COM; stale handles are still retried on error
+            return
+        
+        self._device_enumerator = enumerator
+        self._device_watcher = watcher
+    
+    def _control_volume(self, value: str) -> Dict[str, Any]:
+        """Control system volume (runs on the volume thread)"""
+        return _VOLUME_THREAD.submit(self._control_volume_on_com_thread, value).result()
+    
+    def _control_volume_on_com_thread(self, value: str) -> Dict[str, Any]:
+        """Control system volume through the cached endpoint"""
+        try:
+            from comtypes import COMError
             
-            if value:
-                if value.lower() in ['up', 'increase']:
-                    current = volume.GetMasterVolumeLevelScalar()
-                    volume.SetMasterVolumeLevelScalar(min(current + 0.1, 1.0), None)
-                    return {'success': True, 'message': 'Volume increased'}
-                elif value.lower() in ['down', 'decrease']:
-                    current = volume.GetMasterVolumeLevelScalar()
-                    volume.SetMasterVolumeLevelScalar(max(current - 0.1, 0.0), None)
-                    return {'success': True, 'message': 'Volume decreased'}
-                elif value.lower() == 'mute':
-                    volume.SetMute(1, None)
-                    return {'success': True, 'message': 'Volume muted'}
-                elif value.lower() == 'unmute':
-                    volume.SetMute(0, None)
-                    return {'success': True, 'message': 'Volume unmuted'}
-                else:
-                    # Set specific level (0-100)
-                    try:
-                        level = int(value) / 100.0
-                        volume.SetMasterVolumeLevelScalar(level, None)
-                        return {'success': True, 'message': f'Volume set to {value}%'}
-                    except ValueError:
-                        return {'success': False, 'error': 'Invalid volume value'}
-            else:
-                current = volume.GetMasterVolumeLevelScalar()
-                return {
-                    'success': True,
-                    'result': int(current * 100),
-                    'message': f'Current volume: {int(current * 100)}%'
-                }
+            try:
+                return self._apply_volume(self._get_volume_endpoint(), value)
+            except COMError:
+                # Device went away since activation; activate again and retry once
+                self._release_volume_endpoint()
+                return self._apply_volume(self._get_volume_endpoint(), value)
                 
         except Exception as e:
             return {'success': False, 'error': f'Volume control error: {e}'}
     
+    def _apply_volume(self, volume, value: str) -> Dict[str, Any]:
+        """Apply a volume command to an IAudioEndpointVolume interface"""
+        if value:
+            if value.lower() in ['up', 'increase']:
+                current = self._get_level(volume)
+                self._set_level(volume, min(current + 0.1, 1.0))
+                return {'success': True, 'message': 'Volume increased'}
+            elif value.lower() in ['down', 'decrease']:
+                current = self._get_level(volume)
+                self._set_level(volume, max(current - 0.1, 0.0))
+                return {'success': True, 'message': 'Volume decreased'}
+            elif value.lower() == 'mute':
+                volume.SetMute(1, None)
+                self._forget_level()
+                return {'success': True, 'message': 'Volume muted'}
+            elif value.lower() == 'unmute':
+                volume.SetMute(0, None)
+                self._forget_level()
+                return {'success': True, 'message': 'Volume unmuted'}
+            else:
+                # Set specific level (0-100)
+                try:
+                    level = int(value) / 100.0
+                except ValueError:
+                    return {'success': False, 'error': 'Invalid volume value'}
+                self._set_level(volume, level)
+                return {'success': True, 'message': f'Volume set to {value}%'}
+        else:
+            current = self._get_level(volume)
+            return {
+                'success': True,
+                'result': int(current * 100),
+                'message': f'Current volume: {int(current * 100)}%'
+            }
+    
     def _take_screenshot(self) -> Dict[str, Any]:
-        """Take a screenshot"""
+        """Take a screenshot (runs on the screenshot thread)"""
+        return _SCREENSHOT_THREAD.submit(self._take_screenshot_on_grab_thread).result()
+    
+    def _take_screenshot_on_grab_thread(self) -> Dict[str, Any]:
+        """Take a screenshot with the thread's reused grabber"""
         try:
-            import pyautogui
-            from datetime import datetime
-            from pathlib import Path
-            
             # Save to Pictures folder
-            pictures_dir = Path.home() / "Pictures" / "Smart Assistant Screenshots"
-            pictures_dir.mkdir(exist_ok=True)
+            if not self._screenshots_dir_ready:
+                self._screenshots_dir.mkdir(parents=True, exist_ok=True)
+                self._screenshots_dir_ready = True
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = pictures_dir / f"screenshot_{timestamp}.png"
+            timestamp = datetime.now().strftime(self._ts_format)
+            filename = self._screenshots_dir / f"screenshot_{timestamp}.png"
             
-            screenshot = pyautogui.screenshot()
-            screenshot.save(filename)
+            sct = _mss()
+            if sct is not None:
+                # Raw grab encoded straight to PNG, no PIL image in between
+                import mss.tools
+                img = sct.grab(sct.monitors[1])
+                mss.tools.to_png(img.rgb, img.size, output=str(filename))
+            else:
+                screenshot = _pyautogui().screenshot()
+                screenshot.save(filename)
             
             return {
                 'success': True,
@@ -130,9 +398,7 @@ class SystemTool(Tool):
     def _get_clipboard(self) -> Dict[str, Any]:
         """Get clipboard content"""
         try:
-            import pyperclip
-            
-            content = pyperclip.paste()
+            content = _pyperclip().paste()
             return {
                 'success': True,
                 'result': content,
@@ -3,12 +3,18 @@ Configuration settings for Smart Assistant - 100% Offline Mode
 Environment variables and constants
 """
 
+import json
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Project root (utils/..), resolved once for all paths below
+_PROJECT_DIR = Path(__file__).resolve().parent.parent
+_DATA_DIR = _PROJECT_DIR / "data"
+
 # ============================================================================
 # MODE SETTINGS (Always Offline)
 # ============================================================================
@@ -47,12 +53,12 @@ PYTTSX3_VOLUME = 0.9  # 0.0 to 1.0
 # ============================================================================
 LISTEN_TIMEOUT = 10  # seconds to wait for speech
 LISTEN_PHRASE_TIME_LIMIT = 30  # max seconds to record (longer for complete sentences)
-TEMP_AUDIO_DIR = os.path.join(os.path.dirname(__file__), "..", "assets", "temp")
+TEMP_AUDIO_DIR = str(_PROJECT_DIR / "assets" / "temp")
 
 # ============================================================================
 # MEMORY SETTINGS
 # ============================================================================
-MEMORY_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "memory.json")
+MEMORY_FILE = str(_DATA_DIR / "memory.json")
 AUTO_SAVE_CONVERSATIONS = True  # Auto-save conversations after N messages
 AUTO_SAVE_THRESHOLD = 4  # Save after this many messages (2 Q&A pairs)
 
@@ -93,55 +99,89 @@ TOOLS_ALLOW_FILE_DELETE = False  # Extra safety for file deletion
 DEBUG_MODE = True  # Enable debug logging
 LOG_CONVERSATIONS = False  # Save conversation history to file
 
-# Create temp directory if it doesn't exist
-os.makedirs(TEMP_AUDIO_DIR, exist_ok=True)
-
-# Create data directory if it doesn't exist
-os.makedirs(os.path.dirname(MEMORY_FILE), exist_ok=True)
+# Create temp and data directories if they don't exist (no mkdir on warm starts)
+for _dir in (TEMP_AUDIO_DIR, str(_DATA_DIR)):
+    if not os.path.isdir(_dir):
+        os.makedirs(_dir, exist_ok=True)
 
 # ============================================================================
 # USER SETTINGS (Persistent preferences in JSON)
 # ============================================================================
-USER_SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "user_settings.json")
+USER_SETTINGS_FILE = str(_DATA_DIR / "user_settings.json")  # already resolved
+_USER_SETTINGS_DIR = os.path.dirname(USER_SETTINGS_FILE)
+_DIR_READY = False  # set once the settings directory is known to exist
+
+# Default settings
+_DEFAULT_USER_SETTINGS = {
+    "theme": "dark",
+    "tts_mode": "offline",
+    "tts_voice": "nova",
+    "wake_word_enabled": True,
+    "gesture_enabled": True
+}
+
+# Parsed settings (merged with defaults), reused until the file's mtime changes
+_SETTINGS_CACHE = {"mtime": None, "data": None}
+
+def _cache_user_settings(settings):
+    """Remember settings as the current file content"""
+    _SETTINGS_CACHE["mtime"] = os.stat(USER_SETTINGS_FILE).st_mtime_ns
+    _SETTINGS_CACHE["data"] = {**_DEFAULT_USER_SETTINGS, **settings}
 
 def load_user_settings():
     """Load user settings from JSON file, create with defaults if not exists"""
-    import json
-    
-    # Default settings
-    defaults = {
-        "theme": "dark",
-        "tts_mode": "offline",
-        "tts_voice": "nova",
-        "wake_word_enabled": True,
-        "gesture_enabled": True
-    }
+    defaults = dict(_DEFAULT_USER_SETTINGS)
     
     try:
-        if os.path.exists(USER_SETTINGS_FILE):
+        try:
+            mtime = os.stat(USER_SETTINGS_FILE).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        
+        if mtime is not None:
+            # Unchanged since last read or write: skip the parse
+            if mtime == _SETTINGS_CACHE["mtime"]:
+                return dict(_SETTINGS_CACHE["data"])
+            
             with open(USER_SETTINGS_FILE, 'r', encoding='utf-8') as f:
                 settings = json.load(f)
-                # Merge with defaults for any missing keys
-                return {**defaults, **settings}
+            _SETTINGS_CACHE["mtime"] = mtime
+            # Merge with defaults for any missing keys
+            _SETTINGS_CACHE["data"] = {**defaults, **settings}
+            return dict(_SETTINGS_CACHE["data"])
         else:
             # Create file with defaults
             save_user_settings(defaults)
             return defaults
-    except Exception as e:
+    except (OSError, ValueError, TypeError) as e:
+        # Unreadable file, invalid JSON (JSONDecodeError) or a non-object document
         print(f"Warning: Could not load user settings: {e}. Using defaults.")
         return defaults
 
 def save_user_settings(settings):
     """Save user settings to JSON file"""
-    import json
-    
+    global _DIR_READY
+    tmp = USER_SETTINGS_FILE + '.tmp'
     try:
-        os.makedirs(os.path.dirname(USER_SETTINGS_FILE), exist_ok=True)
-        with open(USER_SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, indent=2, ensure_ascii=False)
+        if not _DIR_READY:
+            os.makedirs(_USER_SETTINGS_DIR, exist_ok=True)
+            _DIR_READY = True
+        data = json.dumps(settings, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        # Write a temp file, flush it to disk, then swap it in atomically
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, USER_SETTINGS_FILE)
+        _cache_user_settings(settings)
         return True
-    except Exception as e:
+    except (OSError, TypeError, ValueError) as e:
+        # Write failure or a value json can't serialize
         print(f"Error: Could not save user settings: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
         return False
 
 def get_user_setting(key, default=None):
@@ -152,6 +192,9 @@ def get_user_setting(key, default=None):
 def save_user_setting(key, value):
     """Save a specific user setting"""
     settings = load_user_settings()
+    # Already stored: skip the write
+    if key in settings and settings[key] == value:
+        return True
     settings[key] = value
     return save_user_settings(settings)
 
@@ -3,7 +3,42 @@ Utility functions for Smart Assistant
 Shared utilities across modules
 """
 
-import urllib.request
+import socket
+import threading
+import time
+
+# Well-known DNS anycast address, probed with a raw TCP connect
+_PROBE_ADDRESS = ("1.1.1.1", 53)
+_PROBE_TTL = 5.0  # seconds a probe result is reused
+
+_LAST = {"ts": 0.0, "val": False}
+_PROBE_LOCK = threading.Lock()
+
+
+def _probe(timeout: float) -> bool:
+    """Open (and close) a TCP connection to the probe address"""
+    try:
+        socket.create_connection(_PROBE_ADDRESS, timeout=timeout).close()
+        online = True
+    except OSError:
+        online = False
+    _LAST["val"] = online
+    _LAST["ts"] = time.monotonic()
+    return online
+
+
+def _probe_in_background(timeout: float):
+    """Run a probe unless one is already in flight"""
+    if not _PROBE_LOCK.acquire(blocking=False):
+        return
+    
+    def run():
+        try:
+            _probe(timeout)
+        finally:
+            _PROBE_LOCK.release()
+    
+    threading.Thread(target=run, daemon=True).start()
 
 
 def check_internet_connection(timeout: int = 2) -> bool:
@@ -14,20 +49,27 @@ def check_internet_connection(timeout: int = 2) -> bool:
         timeout: Timeout in seconds
         
     Returns:
-        bool: True if internet is available
+        bool: True if internet is available (cached for a few seconds)
     """
-    try:
-        urllib.request.urlopen('http://www.google.com', timeout=timeout)
-        return True
-    except:
-        return False
+    if time.monotonic() - _LAST["ts"] < _PROBE_TTL:
+        return _LAST["val"]
+    return _probe(timeout)
 
 
 def get_connection_status() -> str:
     """
     Get human-readable connection status
     
+    Returns the last known status immediately and refreshes it in the
+    background once stale, so UI refreshes never block on the network.
+    
     Returns:
         str: "Online" or "Offline"
     """
-    return "Online" if check_internet_connection() else "Offline"
+    if _LAST["ts"] == 0.0:
+        online = check_internet_connection()
+    else:
+        if time.monotonic() - _LAST["ts"] >= _PROBE_TTL:
+            _probe_in_background(2)
+        online = _LAST["val"]
+    return "Online" if online else "Offline"
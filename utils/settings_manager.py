@@ -5,7 +5,7 @@ Handles actual mode switching, feature toggling, and configuration
 
 import os
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Add parent to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -13,6 +13,9 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 # Import config functions
 from utils.config import load_user_settings, save_user_settings
 
+# Settings persisted to user_settings.json
+_ALLOWED_KEYS = frozenset({'theme', 'tts_mode', 'tts_voice', 'wake_word_enabled', 'gesture_enabled'})
+
 
 class SettingsManager:
     """Manage application settings with backend implementation"""
@@ -37,8 +40,8 @@ class SettingsManager:
             bool: True if successful
         """
         try:
-            # Save to user settings JSON
-            self._save_settings(settings)
+            # Save to user settings JSON (loaded once per apply)
+            self._save_settings(settings, load_user_settings())
             
             # Apply runtime changes
             self._apply_runtime_changes(settings)
@@ -49,23 +52,28 @@ class SettingsManager:
             print(f"❌ Failed to apply settings: {e}")
             return False
     
-    def _save_settings(self, settings: Dict[str, Any]):
-        """Save settings to user_settings.json"""
-        current_settings = load_user_settings()
+    def _save_settings(
+        self,
+        settings: Dict[str, Any],
+        current_settings: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Save settings to user_settings.json
+        
+        Args:
+            settings: Changed settings (keys outside _ALLOWED_KEYS are ignored)
+            current_settings: Already loaded user settings, loaded if omitted
+        """
+        if current_settings is None:
+            current_settings = load_user_settings()
         
         # Update with new settings
-        if 'theme' in settings:
-            current_settings['theme'] = settings['theme']
-        if 'tts_mode' in settings:
-            current_settings['tts_mode'] = settings['tts_mode']
-        if 'tts_voice' in settings:
-            current_settings['tts_voice'] = settings['tts_voice']
-        if 'wake_word_enabled' in settings:
-            current_settings['wake_word_enabled'] = settings['wake_word_enabled']
-        if 'gesture_enabled' in settings:
-            current_settings['gesture_enabled'] = settings['gesture_enabled']
+        merged = current_settings | {k: v for k, v in settings.items() if k in _ALLOWED_KEYS}
+        if merged == current_settings:
+            print("✅ Settings unchanged")
+            return
         
-        if save_user_settings(current_settings):
+        if save_user_settings(merged):
             print("✅ Settings saved to user_settings.json")
         else:
             print("❌ Failed to save settings")